@@ -107,6 +107,24 @@ echo "   Connected with IP: $TAILSCALE_IP"
 # ===== Step 6: Start OGN Config Web Service =====
 echo "6/7 Starting OGN config web service..."
 git pull || echo "   Git pull skipped (not a git repo or no updates)"
+
+# Web UI fonts are bundled in static/fonts; fetch any that are missing from pinned
+# package versions so every station serves identical files
+FONT_CDN=https://cdn.jsdelivr.net/npm
+ORBITRON_PKG=@fontsource-variable/orbitron@5.1.0
+RAJDHANI_PKG=@fontsource/rajdhani@5.1.0
+mkdir -p static/fonts
+fetch_font() {
+    [ -f "static/fonts/$1" ] && return
+    curl -fsSL -o "static/fonts/$1" "$FONT_CDN/$2" || {
+        rm -f "static/fonts/$1"
+        echo "   WARNING: could not fetch $1, the config page falls back to system fonts"
+    }
+}
+fetch_font orbitron-latin.woff2 "$ORBITRON_PKG/files/orbitron-latin-wght-normal.woff2"
+for WEIGHT in 400 500 600 700; do
+    fetch_font "rajdhani-latin-$WEIGHT.woff2" "$RAJDHANI_PKG/files/rajdhani-latin-$WEIGHT-normal.woff2"
+done
 sudo pkill -f ogn-config-web-alpium.py || true
 sleep 2
 nohup sudo python3 ogn-config-web-alpium.py > /var/log/ogn-config-web.log 2>&1 &
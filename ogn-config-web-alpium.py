@@ -3,30 +3,75 @@
 OGN Config Web + Alpium Registration
 Enhanced Flask app with Alpium integration for Pi 3
 """
-from flask import Flask, render_template_string, request, jsonify
+import time
+START_TIME = time.monotonic()  # Startup is measured from here to the first byte served
+
+from flask import Flask, request, jsonify, abort
 import re
 import subprocess
 import os
 import json
-import hmac
 import hashlib
-import requests
+import socket
 import threading
-import time
-from datetime import datetime
+import collections
+import zlib
+from datetime import datetime, timezone
+from wpa_ctrl import WpaCtrl, WpaCtrlError
+from uplink_monitor import UplinkMonitor, SocketProbe, IpRouteController
+from ogn_streams import parse_decode_line, follow_stream
+from reception_stats import ReceptionStats
+
+# Rarely used or slow-to-import modules (requests, hmac, gzip, brotli, shutil)
+# are imported where they are used to keep cold start fast on SD cards.
 
 app = Flask(__name__)
+HTTP_PORT = 8082
 CONFIG_FILE = '/home/hfss/ogn-pi34/rtlsdr-ogn-0.3.2/Template.conf'
-WPA_SUPPLICANT = '/etc/wpa_supplicant/wpa_supplicant.conf'
+WPA_CTRL_DIR = '/var/run/wpa_supplicant'
 CREDENTIALS_FILE = '/home/hfss/.ogn_credentials.json'
 ENV_FILE = '/home/hfss/hfss-pi-flarm-rx/.env'
 HEARTBEAT_LOG_FILE = '/home/hfss/.ogn_heartbeat_log.json'
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
 
 # Alpium Configuration
 HEARTBEAT_INTERVAL = 300  # 5 minutes
 heartbeat_thread = None
 heartbeat_running = False
-heartbeat_history = []  # Store last 1000 heartbeats
+HEARTBEAT_HISTORY_SIZE = 1000
+REGISTRATION_RETRY_DELAYS = [10, 30, 60, 120, 300]  # seconds, last value repeats
+startup_stats = {'ready_ms': None, 'first_byte_ms': None}  # ms since import
+server_ready = threading.Event()  # set once the first request has been answered
+HEALTH_REFRESH_INTERVAL = 15  # seconds between background rebuilds of the /api/health body
+health_cache = {'body': None, 'updated': None}
+
+# Receiver instances (one per RTL-SDR dongle). Without RECEIVERS_FILE the
+# station runs the single default instance below.
+RECEIVERS_FILE = '/home/hfss/.ogn_receivers.json'
+DEFAULT_RECEIVER = {
+    'name': 'ogn',
+    'config_file': CONFIG_FILE,
+    'service': 'rtlsdr-ogn',
+    'http_port': 8080,  # ogn-rf web UI, ogn-decode serves http_port + 1
+    'rf_port': 50000,
+    'decode_port': 50001,
+    'pipe_port': 50010,  # ogn-rf -> ogn-decode pipe (RF.PipeName), must differ per instance
+    'device': None  # RTL-SDR device index (RF.Device), None = driver default
+}
+reception_stats = ReceptionStats()
+reception_stop = threading.Event()
+rf_analyzers = {}  # receiver name -> RfAnalyzer fed from its ogn-rf stream
+rf_analysis_error = None
+
+# Uplink failover, interfaces in preference order (eth1 is usually the LTE dongle)
+UPLINK_INTERFACES = ['wlan0', 'eth1']
+UPLINK_PROBE_INTERVAL = 2  # seconds
+APRS_SERVER = ('aprs.glidernet.org', 14580)
+uplink_monitor = None
+
+# RF calibration (gain sweep + frequency drift estimate)
+CALIBRATION_CAPTURE_FILE = '/home/hfss/.ogn_calibration.ogncap'
+calibration_job = None
 
 # Load environment variables from .env
 def load_env_var(var_name):
@@ -93,53 +138,8 @@ def get_default_hfss_config():
 # HTML Template with Neon Cyberpunk Styling
 HTML = '''<!DOCTYPE html>
 <html><head><title>OGN Config - Alpium</title><meta name="viewport" content="width=device-width, initial-scale=1">
-<link rel="preconnect" href="https://fonts.googleapis.com">
-<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-<link href="https://fonts.googleapis.com/css2?family=Orbitron:wght@400;600;700;900&family=Rajdhani:wght@400;500;600;700&display=swap" rel="stylesheet">
-<style>
-*{margin:0;padding:0;box-sizing:border-box}
-body{font-family:'Rajdhani',sans-serif;background:#0a0e1a;color:#fff;padding:20px;min-height:100vh}
-h1,h2,h3{font-family:'Orbitron',monospace;letter-spacing:1px}
-.container{max-width:1200px;margin:0 auto;background:rgba(15,20,32,0.95);border-radius:12px;box-shadow:0 0 40px rgba(0,255,255,0.15);border:1px solid rgba(0,255,255,0.2);overflow:hidden}
-.header{background:linear-gradient(135deg,rgba(15,20,32,0.98),rgba(20,26,40,0.98));color:#00ffff;padding:24px;border-bottom:2px solid rgba(0,255,255,0.3);position:relative}
-.header::after{content:'';position:absolute;bottom:0;left:0;right:0;height:2px;background:linear-gradient(90deg,transparent,#00ffff,transparent);animation:glow-line 3s ease-in-out infinite}
-.header h1{font-size:28px;margin-bottom:5px;text-shadow:0 0 20px rgba(0,255,255,0.8),0 0 40px rgba(0,255,255,0.4)}
-.content{padding:24px}
-.form-section{background:rgba(20,26,40,0.6);padding:24px;border-radius:10px;margin-bottom:24px;border:1px solid rgba(0,255,255,0.2);transition:all 0.3s ease}
-.form-section:hover{border-color:rgba(0,255,255,0.4);box-shadow:0 0 20px rgba(0,255,255,0.1)}
-.form-section h2{font-size:22px;margin-bottom:20px;color:#00ffff;text-shadow:0 0 10px rgba(0,255,255,0.6)}
-.form-group{margin-bottom:18px}
-.form-group label{display:block;margin-bottom:8px;font-weight:600;color:#00a6fb;font-size:14px;text-transform:uppercase;letter-spacing:0.5px}
-.form-group input,.form-group select{width:100%;padding:12px;border:1px solid rgba(0,166,251,0.3);border-radius:6px;font-size:14px;background:rgba(10,14,26,0.8);color:#fff;font-family:'Rajdhani',sans-serif;transition:all 0.3s ease}
-.form-group input:focus,.form-group select:focus{outline:none;border-color:#00ffff;box-shadow:0 0 15px rgba(0,255,255,0.3)}
-.btn{background:linear-gradient(135deg,#00a6fb,#0080c8);color:#fff;padding:12px 28px;border:none;border-radius:6px;cursor:pointer;font-size:16px;margin-right:12px;font-weight:700;text-transform:uppercase;letter-spacing:1px;transition:all 0.3s ease;font-family:'Orbitron',monospace}
-.btn:hover{transform:translateY(-2px);box-shadow:0 0 25px rgba(0,166,251,0.6);background:linear-gradient(135deg,#00c0ff,#00a6fb)}
-.btn-danger{background:linear-gradient(135deg,#ff006e,#c8005a)}
-.btn-danger:hover{box-shadow:0 0 25px rgba(255,0,110,0.6);background:linear-gradient(135deg,#ff2080,#ff006e)}
-.btn-success{background:linear-gradient(135deg,#14f195,#0ac97a)}
-.btn-success:hover{box-shadow:0 0 25px rgba(20,241,149,0.6);background:linear-gradient(135deg,#20ff9e,#14f195)}
-.status{padding:16px;border-radius:8px;margin-bottom:20px;border:1px solid;font-weight:600}
-.status.success{background:rgba(20,241,149,0.1);color:#14f195;border-color:rgba(20,241,149,0.3)}
-.status.error{background:rgba(255,0,110,0.1);color:#ff006e;border-color:rgba(255,0,110,0.3)}
-.info-box{background:rgba(0,166,251,0.05);border-left:4px solid #00a6fb;padding:16px;margin-bottom:20px;border-radius:6px}
-.info-box strong{color:#00ffff}
-iframe{width:100%;height:600px;border:1px solid rgba(0,255,255,0.2);border-radius:8px;margin-top:20px;background:#f5f5f5}
-.wifi-status{display:inline-block;padding:6px 12px;border-radius:6px;font-weight:700;font-size:13px;text-transform:uppercase;letter-spacing:0.5px}
-.wifi-on{background:rgba(20,241,149,0.2);color:#14f195;border:1px solid rgba(20,241,149,0.4)}
-.wifi-off{background:rgba(255,0,110,0.2);color:#ff006e;border:1px solid rgba(255,0,110,0.4)}
-.network-list{list-style:none;padding:0}
-.network-item{background:rgba(20,26,40,0.5);padding:16px;margin:12px 0;border:1px solid rgba(0,166,251,0.2);border-radius:8px;display:flex;justify-content:space-between;align-items:center;transition:all 0.3s ease}
-.network-item:hover{border-color:rgba(0,255,255,0.4);box-shadow:0 0 15px rgba(0,255,255,0.1)}
-.network-item .network-info{flex:1}
-.network-item .network-ssid{font-weight:700;color:#00ffff;font-size:16px}
-.network-item .network-status{font-size:12px;color:#adb5bd;margin-top:4px}
-.btn-small{padding:8px 18px;font-size:13px}
-.hfss-status{padding:12px;border-radius:8px;margin:12px 0;font-weight:700;text-transform:uppercase;letter-spacing:1px;border:2px solid}
-.hfss-registered{background:rgba(20,241,149,0.1);color:#14f195;border-color:rgba(20,241,149,0.4);animation:pulse-glow 2s ease-in-out infinite}
-.hfss-notregistered{background:rgba(153,69,255,0.1);color:#9945ff;border-color:rgba(153,69,255,0.4)}
-@keyframes glow-line{0%,100%{opacity:0.5;transform:scaleX(0.8)}50%{opacity:1;transform:scaleX(1)}}
-@keyframes pulse-glow{0%,100%{box-shadow:0 0 10px rgba(20,241,149,0.3)}50%{box-shadow:0 0 20px rgba(20,241,149,0.6)}}
-</style>
+<link rel="stylesheet" href="{{asset_url('ogn-config.css')}}">
+<script src="{{asset_url('ogn-config.js')}}" defer></script>
 </head><body><div class="container"><div class="header"><h1>⚡ OGN Receiver Configuration - Alpium</h1></div>
 <div class="content"><div id="status"></div>
 
@@ -175,7 +175,8 @@ iframe{width:100%;height:600px;border:1px solid rgba(0,255,255,0.2);border-radiu
 <div class="info-box">
 <strong>WiFi Status:</strong> <span class="wifi-status wifi-{{wifi.wlan0_status}}">wlan0: {{wifi.wlan0_status|upper}}</span>
 <span class="wifi-status wifi-{{wifi.eth1_status}}">eth1: {{wifi.eth1_status|upper}}</span><br>
-<strong>Active IP:</strong> wlan0: {{wifi.wlan0_ip}} | eth1: {{wifi.eth1_ip}}
+<strong>Active IP:</strong> wlan0: {{wifi.wlan0_ip}} | eth1: {{wifi.eth1_ip}}<br>
+<strong>wlan0 Link:</strong> {{wifi.wlan0_ssid}} ({{wifi.wlan0_signal}})
 </div>
 <button class="btn btn-danger" onclick="toggleWifi('wlan0','off')">Turn OFF wlan0</button>
 <button class="btn btn-success" onclick="toggleWifi('wlan0','on')">Turn ON wlan0</button>
@@ -206,8 +207,13 @@ iframe{width:100%;height:600px;border:1px solid rgba(0,255,255,0.2);border-radiu
 </form>
 </div>
 
+{% if receivers|length > 1 %}
+<div class="info-box"><strong>Receiver:</strong>
+{% for name in receivers %}<a class="btn btn-small{% if name != receiver %} btn-success{% endif %}" href="/?receiver={{name}}">{{name}}</a>{% endfor %}
+</div>
+{% endif %}
 <div class="info-box"><strong>Station:</strong> {{config.call}}<br><strong>Location:</strong> {{config.latitude}}, {{config.longitude}} @ {{config.altitude}}m</div>
-<form id="f"><div class="form-section"><h2>Station</h2>
+<form id="f"><input type="hidden" name="receiver" value="{{receiver}}"><div class="form-section"><h2>Station</h2>
 <div class="form-group"><label>Callsign</label><input name="call" value="{{config.call}}" maxlength="9" required></div></div>
 <div class="form-section"><h2>Location</h2>
 <div class="form-group"><label>Latitude</label><input type="number" name="latitude" value="{{config.latitude}}" step="0.000001" required></div>
@@ -216,105 +222,156 @@ iframe{width:100%;height:600px;border:1px solid rgba(0,255,255,0.2);border-radiu
 <div class="form-section"><h2>RF</h2>
 <div class="form-group"><label>Freq Correction (PPM)</label><input type="number" name="freqcorr" value="{{config.freqcorr}}" step="0.1"></div>
 <div class="form-group"><label>Center Freq (MHz)</label><input type="number" name="centerfreq" value="{{config.centerfreq}}" step="0.1"></div>
-<div class="form-group"><label>Gain (dB)</label><input type="number" name="gain" value="{{config.gain}}" step="0.1"></div></div>
+<div class="form-group"><label>Gain (dB)</label><input type="number" name="gain" value="{{config.gain}}" step="0.1"></div>
+<button type="button" class="btn btn-small" onclick="startCalibration()">Auto-Calibrate Gain & PPM</button>
+<div id="calibration" class="info-box" style="display:none;margin-top:16px"></div></div>
 <button type="submit" class="btn" id="b">Save & Restart</button></form></div></div>
-<script>
-async function toggleWifi(iface,action){
-const r=await fetch('/api/wifi/toggle',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({interface:iface,action:action})});
-const j=await r.json();document.getElementById('status').innerHTML='<div class="status '+(j.success?'success':'error')+'">'+j.message+'</div>';
-if(j.success)setTimeout(()=>location.reload(),2000);
-}
-async function deleteNetwork(id){
-if(!confirm('Delete this network?'))return;
-const r=await fetch('/api/wifi/delete',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({network_id:id})});
-const j=await r.json();document.getElementById('status').innerHTML='<div class="status '+(j.success?'success':'error')+'">'+j.message+'</div>';
-if(j.success)setTimeout(()=>location.reload(),1500);
-}
-function editNetwork(id,ssid){
-const psk=prompt('Enter new password for '+ssid+':');
-if(!psk)return;
-fetch('/api/wifi/edit',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({network_id:id,psk:psk})})
-.then(r=>r.json()).then(j=>{document.getElementById('status').innerHTML='<div class="status '+(j.success?'success':'error')+'">'+j.message+'</div>';
-if(j.success)setTimeout(()=>location.reload(),1500);});
-}
-async function unregisterHFSS(){
-if(!confirm('Unregister from Alpium? Heartbeat will stop.'))return;
-const r=await fetch('/api/hfss/unregister',{method:'POST'});
-const j=await r.json();document.getElementById('status').innerHTML='<div class="status '+(j.success?'success':'error')+'">'+j.message+'</div>';
-if(j.success)setTimeout(()=>location.reload(),1500);
-}
-async function viewHeartbeatLogs(){
-const container=document.getElementById('heartbeat-logs');
-if(container.style.display==='none'){
-const r=await fetch('/api/hfss/heartbeat-logs');
-const j=await r.json();
-if(j.success){
-const logsDiv=document.getElementById('logs-container');
-logsDiv.innerHTML='';
-j.logs.reverse().forEach(log=>{
-const entry=document.createElement('div');
-entry.style.cssText='margin-bottom:15px;padding:12px;background:rgba(20,26,40,0.5);border-radius:8px;border:1px solid rgba(0,166,251,0.2)';
-const statusColor=log.response_status===200?'#14f195':log.response_status===0?'#9945ff':'#ff006e';
-const toggleId='log-'+Math.random().toString(36).substr(2,9);
-const header=document.createElement('div');
-header.style.marginBottom='10px';
-header.innerHTML='<strong style="color:'+statusColor+'">'+log.timestamp+'</strong> - <span style="font-weight:bold;color:'+statusColor+'">Status: '+log.response_status+'</span>';
-const btn=document.createElement('button');
-btn.className='btn btn-small';
-btn.textContent='Toggle Details';
-btn.onclick=function(){const d=document.getElementById(toggleId);d.style.display=d.style.display==='none'?'block':'none'};
-const details=document.createElement('div');
-details.id=toggleId;
-details.style.cssText='display:none;margin-top:10px';
-const payloadPre=document.createElement('pre');
-payloadPre.style.cssText='background:rgba(10,14,26,0.8);padding:10px;border-radius:6px;overflow-x:auto;font-size:11px;color:#adb5bd;border:1px solid rgba(0,166,251,0.2)';
-payloadPre.textContent=JSON.stringify(log.payload,null,2);
-const respPre=document.createElement('pre');
-respPre.style.cssText='background:rgba(10,14,26,0.8);padding:10px;border-radius:6px;overflow-x:auto;font-size:11px;margin-top:10px;color:#adb5bd;border:1px solid rgba(0,166,251,0.2)';
-respPre.textContent=log.response_text;
-details.innerHTML='<strong style="color:#00a6fb;">Payload:</strong>';
-details.appendChild(payloadPre);
-details.innerHTML+='<strong style="color:#00a6fb;display:block;margin-top:12px;">Response:</strong>';
-details.appendChild(respPre);
-entry.appendChild(header);
-entry.appendChild(btn);
-entry.appendChild(details);
-logsDiv.appendChild(entry);
-});
-container.style.display='block';
-}else{
-alert('Failed to load logs: '+j.message);
-}
-}else{
-container.style.display='none';
-}
+</body></html>'''
+
+# Static assets: served from memory under content-hash URLs, compressed once on first request
+ASSET_MAX_AGE = 31536000  # 1 year, safe because URLs change with content
+ASSET_TYPES = {
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8',
+    '.woff2': 'font/woff2'
 }
-document.getElementById('wifiForm').onsubmit=async(e)=>{e.preventDefault();
-const d=Object.fromEntries(new FormData(e.target));
-const r=await fetch('/api/wifi/add',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify(d)});
-const j=await r.json();document.getElementById('status').innerHTML='<div class="status '+(j.success?'success':'error')+'">'+j.message+'</div>';
-if(j.success){e.target.reset();setTimeout(()=>location.reload(),1500);}
-};
-if(document.getElementById('hfssForm')){
-document.getElementById('hfssForm').onsubmit=async(e)=>{e.preventDefault();
-const d=Object.fromEntries(new FormData(e.target));
-const r=await fetch('/api/hfss/register',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify(d)});
-const j=await r.json();document.getElementById('status').innerHTML='<div class="status '+(j.success?'success':'error')+'">'+j.message+'</div>';
-if(j.success)setTimeout(()=>location.reload(),2000);
-};
-}
-document.getElementById('f').onsubmit=async(e)=>{e.preventDefault();document.getElementById('b').disabled=true;
-const d=Object.fromEntries(new FormData(e.target));
-try{const r=await fetch('/api/save',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify(d)});
-const j=await r.json();document.getElementById('status').innerHTML='<div class="status '+(j.success?'success':'error')+'">'+j.message+'</div>';
-if(j.success)setTimeout(()=>location.reload(),2000);}catch(e){document.getElementById('status').innerHTML='<div class="status error">Error: '+e.message+'</div>';}
-document.getElementById('b').disabled=false;};
-</script></body></html>'''
-
-def read_config():
+assets = {}
+
+def add_asset(name, data, brotli=None):
+    """Register an asset with its precompressed variants (woff2 is already compressed)"""
+    ext = os.path.splitext(name)[1]
+    asset = assets[name] = {
+        'digest': hashlib.sha256(data).hexdigest()[:16],
+        'type': ASSET_TYPES.get(ext, 'application/octet-stream'),
+        'identity': data
+    }
+    if ext != '.woff2':
+        gz = zlib.compressobj(9, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+        asset['gzip'] = gz.compress(data) + gz.flush()
+        if brotli:
+            asset['br'] = brotli.compress(data, quality=11)
+
+def asset_url(name):
+    asset = assets.get(name)
+    return f"/assets/{asset['digest']}/{name}" if asset else f'/static/{name}'
+
+def load_assets():
+    """Load fonts, CSS and JS from STATIC_DIR, compute their content-hash URLs and compress them"""
+    try:
+        import brotli  # optional, gzip is always available
+    except ImportError:
+        brotli = None
+    fonts_dir = os.path.join(STATIC_DIR, 'fonts')
+    if os.path.isdir(fonts_dir):
+        for fname in sorted(os.listdir(fonts_dir)):
+            if fname.endswith('.woff2'):
+                with open(os.path.join(fonts_dir, fname), 'rb') as f:
+                    add_asset(f'fonts/{fname}', f.read())
+
+    for name in ('ogn-config.css', 'ogn-config.js'):
+        try:
+            with open(os.path.join(STATIC_DIR, name), 'rb') as f:
+                data = f.read()
+        except Exception as e:
+            print(f"Failed to load asset {name}: {e}")
+            continue
+        if name.endswith('.css'):
+            # Point font URLs at their hashed asset URLs; drop fonts that aren't bundled
+            css = data.decode('utf-8')
+            css = re.sub(r",url\((fonts/[^)]+)\) format\('woff2'\)",
+                         lambda m: f",url({asset_url(m.group(1))}) format('woff2')" if m.group(1) in assets else '',
+                         css)
+            data = css.encode('utf-8')
+        add_asset(name, data, brotli)
+
+load_assets()
+ASSET_VERSION = ''.join(a['digest'] for _, a in sorted(assets.items()))
+INDEX_TEMPLATE = app.jinja_env.from_string(HTML)
+
+def load_receivers():
+    """Configured receiver instances, the first one is the primary"""
+    try:
+        if os.path.exists(RECEIVERS_FILE):
+            with open(RECEIVERS_FILE,'r') as f:
+                receivers = [{**DEFAULT_RECEIVER, **r} for r in json.load(f)]
+            if receivers:
+                return receivers
+    except Exception as e:
+        print(f"Failed to load {RECEIVERS_FILE}: {e}")
+    return [dict(DEFAULT_RECEIVER)]
+
+def get_receiver(name=None):
+    receivers = load_receivers()
+    if not name:
+        return receivers[0]
+    for r in receivers:
+        if r['name'] == name:
+            return r
+    raise ValueError(f'Unknown receiver {name}')
+
+def port_open(port, timeout=0.5):
+    try:
+        with socket.create_connection(('127.0.0.1', port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+def receiver_health(receiver):
+    """Probe an instance's ogn-rf and ogn-decode through their own HTTP ports"""
+    rf_running = port_open(receiver['http_port'])
+    decode_running = port_open(receiver['http_port'] + 1)
+    return {
+        'name': receiver['name'],
+        'rf_running': rf_running,
+        'decode_running': decode_running,
+        'status': 'online' if (rf_running and decode_running) else 'offline'
+    }
+
+def get_receivers_status():
+    """Per-instance health merged with its reception counts"""
+    stats = reception_stats.snapshot()
+    receivers = []
+    for r in load_receivers():
+        counts = stats['receivers'].get(r['name'], {'positions_per_min': 0.0, 'aircraft': 0})
+        receivers.append({**receiver_health(r), **counts})
+    return receivers, {k: v for k, v in stats.items() if k != 'receivers'}
+
+def start_reception_stats():
+    """Follow every instance's decode stream and count positions across instances"""
+    for r in load_receivers():
+        def on_line(line, ts, name=r['name']):
+            rec = parse_decode_line(line)
+            if rec:
+                reception_stats.add(name, rec, ts)
+        threading.Thread(target=follow_stream, args=('localhost', r['decode_port'], on_line, reception_stop),
+                         daemon=True).start()
+
+def rf_analyzer_worker(receiver):
+    """Create the receiver's analyzer and follow its ogn-rf stream; numpy is imported here, off the startup path"""
+    global rf_analysis_error
+    try:
+        from rf_analyzer import RfAnalyzer
+        analyzer = RfAnalyzer()
+    except ImportError as e:
+        rf_analysis_error = f'RF analysis disabled: {e}'
+        print(rf_analysis_error)
+        return
+    rf_analyzers[receiver['name']] = analyzer
+    follow_stream('localhost', receiver['rf_port'], analyzer.feed, reception_stop)
+
+def start_rf_analyzers():
+    """Follow every instance's ogn-rf stream into a rolling RF analyzer (needs numpy)"""
+    for r in load_receivers():
+        threading.Thread(target=rf_analyzer_worker, args=(r,), daemon=True).start()
+
+def get_rf_summary():
+    return {name: analyzer.summary() for name, analyzer in list(rf_analyzers.items())}
+
+def read_config(receiver=None):
+    receiver = receiver or get_receiver()
     config = {'call':'NOCALL','latitude':0.0,'longitude':0.0,'altitude':0,'freqcorr':0.0,'centerfreq':868.2,'gain':40.0}
     try:
-        with open(CONFIG_FILE,'r') as f:content=f.read()
+        with open(receiver['config_file'],'r') as f:content=f.read()
         if m:=re.search(r'Call = "([^"]+)"',content):config['call']=m.group(1)
         if m:=re.search(r'Latitude\s*=\s*([\d.-]+)',content):config['latitude']=float(m.group(1))
         if m:=re.search(r'Longitude\s*=\s*([\d.-]+)',content):config['longitude']=float(m.group(1))
@@ -325,9 +382,12 @@ def read_config():
     except:pass
     return config
 
-def write_config(d):
+def write_config(d, receiver=None):
+    receiver = receiver or get_receiver()
+    device = f"\n  Device = {int(receiver['device'])};" if receiver.get('device') is not None else ''
     cfg=f'''RF:
-{{
+{{{device}
+  PipeName = "localhost:{int(receiver['pipe_port'])}";
   FreqCorr = {d['freqcorr']};
   GSM: {{ CenterFreq = 950.0; Gain = 30.0; }};
   OGN: {{ CenterFreq = {d['centerfreq']}; Gain = {d['gain']}; }};
@@ -348,14 +408,25 @@ APRS:
 
 HTTP:
 {{
-  Port = 8080;
+  Port = {receiver['http_port']};
 }};
 '''
     try:
-        with open(CONFIG_FILE,'w') as f:f.write(cfg)
+        with open(receiver['config_file'],'w') as f:f.write(cfg)
         return True
     except:return False
 
+def restart_receiver(receiver=None):
+    receiver = receiver or get_receiver()
+    subprocess.run(['sudo','service',receiver['service'],'restart'],check=True)
+
+def set_receiver_gain(gain, receiver=None):
+    config = read_config(receiver)
+    config['gain'] = gain
+    if not write_config(config, receiver):
+        raise RuntimeError('Failed to write config')
+    restart_receiver(receiver)
+
 def get_ip():
     # Prefer Tailscale IP for iframe (works over VPN)
     tailscale_ip = get_tailscale_ip()
@@ -367,8 +438,11 @@ def get_ip():
     except:
         return 'localhost'
 
+wpa = WpaCtrl('wlan0', WPA_CTRL_DIR)
+
 def get_wifi_status():
-    status = {'wlan0_status':'unknown','eth1_status':'unknown','wlan0_ip':'N/A','eth1_ip':'N/A','networks':[]}
+    status = {'wlan0_status':'unknown','eth1_status':'unknown','wlan0_ip':'N/A','eth1_ip':'N/A',
+              'wlan0_ssid':'N/A','wlan0_signal':'N/A','networks':[]}
     try:
         result = subprocess.run(['ip','link','show','wlan0'],capture_output=True,text=True)
         status['wlan0_status'] = 'on' if 'state UP' in result.stdout else 'off'
@@ -378,44 +452,34 @@ def get_wifi_status():
         if m:=re.search(r'inet ([\d.]+)',result.stdout):status['wlan0_ip']=m.group(1)
         result = subprocess.run(['ip','addr','show','eth1'],capture_output=True,text=True)
         if m:=re.search(r'inet ([\d.]+)',result.stdout):status['eth1_ip']=m.group(1)
-        if os.path.exists(WPA_SUPPLICANT):
-            with open(WPA_SUPPLICANT,'r') as f:content=f.read()
-            networks = re.findall(r'network=\{([^}]+)\}',content,re.DOTALL)
-            for i,net in enumerate(networks):
-                ssid = re.search(r'ssid="([^"]+)"',net)
-                priority = re.search(r'priority=(\d+)',net)
-                if ssid:
-                    status['networks'].append({
-                        'id':i,
-                        'ssid':ssid.group(1),
-                        'status':f"Priority: {priority.group(1) if priority else '0'}"
-                    })
     except:pass
-    return status
-
-def read_wpa_networks():
-    networks = []
     try:
-        if os.path.exists(WPA_SUPPLICANT):
-            with open(WPA_SUPPLICANT,'r') as f:content=f.read()
-            networks = re.findall(r'network=\{([^}]+)\}',content,re.DOTALL)
-    except:pass
-    return networks
-
-def write_wpa_config(networks):
-    header = '''ctrl_interface=DIR=/var/run/wpa_supplicant GROUP=netdev
-update_config=1
-country=CH
+        status['wlan0_ssid'] = wpa.status().get('ssid', 'N/A')
+        rssi = wpa.signal_poll().get('RSSI')
+        if rssi:status['wlan0_signal'] = f'{rssi} dBm'
+        for net in wpa.list_networks():
+            priority = wpa.get_network(net['id'], 'priority') or '0'
+            state = 'Connected' if net['current'] else 'Disabled' if net['disabled'] else 'Saved'
+            status['networks'].append({'id':net['id'],'ssid':net['ssid'],'status':f'{state} | Priority: {priority}'})
+    except (WpaCtrlError, ValueError) as e:
+        print(f"wpa_supplicant unavailable: {e}")
+    return status
 
-'''
-    try:
-        with open(WPA_SUPPLICANT,'w') as f:
-            f.write(header)
-            for net in networks:
-                f.write(f'network={{{net}}}\n\n')
-        subprocess.run(['sudo','wpa_cli','-i','wlan0','reconfigure'],check=False)
-        return True
-    except:return False
+def start_uplink_monitor():
+    """Probe the APRS server and the Alpium API through each uplink and fail over the default route"""
+    global uplink_monitor
+    from urllib.parse import urlparse
+    server_host = urlparse(load_env_var('SERVER_URL') or 'https://ogn.alpium.io/api/v1').hostname
+    uplink_monitor = UplinkMonitor(
+        UPLINK_INTERFACES,
+        SocketProbe([APRS_SERVER, (server_host, 443)], timeout=1.5),
+        IpRouteController(),
+        interval=UPLINK_PROBE_INTERVAL
+    )
+    uplink_monitor.start()
+
+def wpa_network_exists(net_id):
+    return any(net['id'] == net_id for net in wpa.list_networks())
 
 # HFSS Functions
 def load_credentials():
@@ -436,36 +500,161 @@ def save_credentials(creds):
     except:
         return False
 
+class HeartbeatRecord:
+    """One heartbeat attempt; payload and response bodies live in the history's blob store"""
+    __slots__ = ('ts', 'status', 'latency_ms', 'payload_hash', 'response_hash')
+
+    def __init__(self, ts, status, latency_ms, payload_hash, response_hash):
+        self.ts = ts
+        self.status = status
+        self.latency_ms = latency_ms
+        self.payload_hash = payload_hash
+        self.response_hash = response_hash
+
+class HeartbeatHistory:
+    """Thread-safe ring of HeartbeatRecords.
+
+    Payloads and responses are stored once per distinct content, zlib-compressed
+    and reference counted, and only expanded when the logs are requested.
+    """
+
+    def __init__(self, size):
+        self._lock = threading.Lock()
+        self._records = collections.deque(maxlen=size)
+        self._blobs = {}  # hash -> [compressed bytes, refcount]
+
+    def _put_blob(self, text):
+        data = text.encode('utf-8')
+        key = hashlib.blake2b(data, digest_size=8).hexdigest()
+        blob = self._blobs.get(key)
+        if blob:
+            blob[1] += 1
+        else:
+            self._blobs[key] = [zlib.compress(data), 1]
+        return key
+
+    def _drop_blob(self, key):
+        blob = self._blobs[key]
+        blob[1] -= 1
+        if blob[1] == 0:
+            del self._blobs[key]
+
+    def append(self, payload, status, response_text, latency_ms=None, ts=None):
+        payload_json = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+        with self._lock:
+            if len(self._records) == self._records.maxlen:
+                oldest = self._records[0]
+                self._drop_blob(oldest.payload_hash)
+                self._drop_blob(oldest.response_hash)
+            self._records.append(HeartbeatRecord(
+                time.time() if ts is None else ts,
+                int(status),
+                None if latency_ms is None else round(latency_ms, 1),
+                self._put_blob(payload_json),
+                self._put_blob(response_text or '')
+            ))
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+            self._blobs.clear()
+
+    def __len__(self):
+        return len(self._records)
+
+    def snapshot(self, details=True):
+        """Consistent copy of the history as JSON-ready dicts, oldest first"""
+        with self._lock:
+            records = list(self._records)
+            blobs = {k: b[0] for k, b in self._blobs.items()} if details else None
+        entries = []
+        for r in records:
+            entry = {
+                "timestamp": datetime.fromtimestamp(r.ts, timezone.utc).replace(tzinfo=None).isoformat(),
+                "response_status": r.status,
+                "latency_ms": r.latency_ms,
+                "payload_hash": r.payload_hash
+            }
+            if details:
+                entry["payload"] = json.loads(zlib.decompress(blobs[r.payload_hash]))
+                entry["response_text"] = zlib.decompress(blobs[r.response_hash]).decode('utf-8')
+            entries.append(entry)
+        return entries
+
+heartbeat_history = HeartbeatHistory(HEARTBEAT_HISTORY_SIZE)
+heartbeat_log_lock = threading.Lock()  # orders the background load against appends
+heartbeat_log_lines = 0
+
+def _heartbeat_log_line(ts, payload, response_status, response_text, latency_ms):
+    return json.dumps({
+        "timestamp": datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat(),
+        "payload": payload,
+        "response_status": response_status,
+        "response_text": response_text,
+        "latency_ms": None if latency_ms is None else round(latency_ms, 1)
+    }, separators=(',', ':')) + '\n'
+
+def _rewrite_heartbeat_log():
+    """Replace the log with the in-memory history, one JSON object per line"""
+    global heartbeat_log_lines
+    entries = heartbeat_history.snapshot()
+    tmp = HEARTBEAT_LOG_FILE + '.tmp'
+    with open(tmp, 'w') as f:
+        for e in entries:
+            f.write(json.dumps({k: e[k] for k in ('timestamp', 'payload', 'response_status', 'response_text', 'latency_ms')},
+                               separators=(',', ':')) + '\n')
+    os.replace(tmp, HEARTBEAT_LOG_FILE)
+    heartbeat_log_lines = len(entries)
+
 def load_heartbeat_history():
-    global heartbeat_history
-    if os.path.exists(HEARTBEAT_LOG_FILE):
+    """Load the JSONL heartbeat log (or the older single JSON list) into memory"""
+    global heartbeat_log_lines
+    with heartbeat_log_lock:
+        heartbeat_history.clear()
+        heartbeat_log_lines = 0
+        if not os.path.exists(HEARTBEAT_LOG_FILE):
+            return
         try:
             with open(HEARTBEAT_LOG_FILE, 'r') as f:
-                heartbeat_history = json.load(f)
-        except:
-            heartbeat_history = []
-    else:
-        heartbeat_history = []
-
-def save_heartbeat_log(payload, response_status, response_text):
-    global heartbeat_history
-    entry = {
-        "timestamp": datetime.utcnow().isoformat(),
-        "payload": payload,
-        "response_status": response_status,
-        "response_text": response_text
-    }
-    heartbeat_history.append(entry)
-    # Keep only last 100 entries to prevent file from growing too large
-    if len(heartbeat_history) > 100:
-        heartbeat_history = heartbeat_history[-100:]
-    try:
-        with open(HEARTBEAT_LOG_FILE, 'w') as f:
-            json.dump(heartbeat_history, f, indent=2)
-    except Exception as e:
-        print(f"Failed to save heartbeat log: {e}")
+                text = f.read()
+            legacy = text.lstrip().startswith('[')
+            if legacy:
+                entries = json.loads(text)
+            else:
+                entries = []
+                for line in text.splitlines():
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        pass  # torn last line after a power cut
+            for e in entries[-HEARTBEAT_HISTORY_SIZE:]:
+                ts = datetime.fromisoformat(e['timestamp']).replace(tzinfo=timezone.utc).timestamp()
+                heartbeat_history.append(e.get('payload') or {}, e.get('response_status', 0),
+                                         e.get('response_text', ''), e.get('latency_ms'), ts)
+            heartbeat_log_lines = len(entries)
+            if legacy:
+                _rewrite_heartbeat_log()
+        except Exception as e:
+            print(f"Failed to load heartbeat log: {e}")
+
+def save_heartbeat_log(payload, response_status, response_text, latency_ms=None):
+    """Record a heartbeat and append it to the log; the file is compacted once it doubles"""
+    global heartbeat_log_lines
+    ts = time.time()
+    with heartbeat_log_lock:
+        heartbeat_history.append(payload, response_status, response_text, latency_ms, ts)
+        try:
+            if heartbeat_log_lines >= 2 * HEARTBEAT_HISTORY_SIZE:
+                _rewrite_heartbeat_log()
+            else:
+                with open(HEARTBEAT_LOG_FILE, 'a') as f:
+                    f.write(_heartbeat_log_line(ts, payload, response_status, response_text, latency_ms))
+                heartbeat_log_lines += 1
+        except Exception as e:
+            print(f"Failed to save heartbeat log: {e}")
 
 def generate_registration_token(device_id, manufacturer, secret):
+    import hmac
     message = f"{manufacturer}:{device_id}"
     token = hmac.new(secret.encode(), message.encode(), hashlib.sha256).hexdigest()
     return token
@@ -535,6 +724,7 @@ def get_station_status():
 def heartbeat_worker():
     global heartbeat_running
     while heartbeat_running:
+        sent_at = None
         try:
             creds = load_credentials()
             if not creds or not heartbeat_running:
@@ -542,6 +732,7 @@ def heartbeat_worker():
 
             config = read_config()
             status = get_station_status()
+            receivers, reception = get_receivers_status()
             serial = get_raspberry_pi_serial()
             tailscale_ip = get_tailscale_ip()
 
@@ -569,10 +760,17 @@ def heartbeat_worker():
                     "memory_usage_percent": status.get("memory_usage_percent"),
                     "ogn_rf_running": status.get("ogn_rf_running"),
                     "ogn_decode_running": status.get("ogn_decode_running"),
+                    "startup_ms": startup_stats.get("first_byte_ms"),
+                    "uplink": uplink_monitor.snapshot() if uplink_monitor else None,
+                    "receivers": receivers,
+                    "reception": reception,
+                    "rf": get_rf_summary(),
                     "timestamp": status["timestamp"]
                 }
             }
 
+            import requests
+            sent_at = time.monotonic()
             response = requests.post(
                 f"{creds['server_url']}/gps/",
                 headers={
@@ -583,7 +781,8 @@ def heartbeat_worker():
                 timeout=10
             )
 
-            save_heartbeat_log(payload, response.status_code, response.text)
+            latency_ms = (time.monotonic() - sent_at) * 1000
+            save_heartbeat_log(payload, response.status_code, response.text, latency_ms)
 
             if response.status_code == 200:
                 creds['last_heartbeat'] = datetime.utcnow().isoformat()
@@ -594,7 +793,8 @@ def heartbeat_worker():
 
         except Exception as e:
             print(f"Heartbeat error: {e}")
-            save_heartbeat_log(payload if 'payload' in locals() else {}, 0, str(e))
+            latency_ms = (time.monotonic() - sent_at) * 1000 if sent_at else None
+            save_heartbeat_log(payload if 'payload' in locals() else {}, 0, str(e), latency_ms)
 
         time.sleep(HEARTBEAT_INTERVAL)
 
@@ -635,16 +835,49 @@ def get_hfss_status():
 
 @app.route('/')
 def index():
-    return render_template_string(HTML,config=read_config(),wifi=get_wifi_status(),hfss=get_hfss_status(),hfss_defaults=get_default_hfss_config())
+    try:
+        receiver = get_receiver(request.args.get('receiver'))
+    except ValueError:
+        abort(404)
+    state = dict(config=read_config(receiver),wifi=get_wifi_status(),hfss=get_hfss_status(),hfss_defaults=get_default_hfss_config(),
+                 receiver=receiver['name'],receivers=[r['name'] for r in load_receivers()])
+    etag = hashlib.sha256((ASSET_VERSION + json.dumps(state, sort_keys=True, default=str)).encode()).hexdigest()[:32]
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(INDEX_TEMPLATE.render(asset_url=asset_url, **state), mimetype='text/html')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/assets/<digest>/<path:name>')
+def static_asset(digest, name):
+    asset = assets.get(name)
+    if not asset or asset['digest'] != digest:
+        abort(404)
+    body, encoding = asset['identity'], None
+    for candidate in ('br', 'gzip'):
+        if candidate in asset and candidate in request.accept_encodings:
+            body, encoding = asset[candidate], candidate
+            break
+    response = app.response_class(body, content_type=asset['type'])
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    response.set_etag(digest)
+    return response
 
 @app.route('/api/save',methods=['POST'])
 def save():
     try:
         d=request.json
         if not d.get('call') or len(d['call'])>9:return jsonify({'success':False,'message':'Invalid callsign'})
-        if not write_config(d):return jsonify({'success':False,'message':'Failed to write config'})
-        subprocess.run(['sudo','service','rtlsdr-ogn','restart'],check=True)
-        return jsonify({'success':True,'message':'Configuration saved and service restarted!'})
+        if calibration_job and calibration_job.is_running():return jsonify({'success':False,'message':'Calibration in progress'})
+        receiver=get_receiver(d.get('receiver'))
+        if not write_config(d,receiver):return jsonify({'success':False,'message':'Failed to write config'})
+        restart_receiver(receiver)
+        return jsonify({'success':True,'message':f"Configuration saved and {receiver['service']} restarted!"})
     except Exception as e:return jsonify({'success':False,'message':str(e)})
 
 @app.route('/api/wifi/toggle',methods=['POST'])
@@ -669,16 +902,9 @@ def wifi_add():
         d=request.json
         ssid=d.get('ssid','')
         psk=d.get('psk','')
-        priority=d.get('priority',1)
+        priority=int(d.get('priority') or 1)
         if not ssid or not psk:return jsonify({'success':False,'message':'SSID and password required'})
-        networks=read_wpa_networks()
-        new_network=f'''
-	ssid="{ssid}"
-	psk="{psk}"
-	priority={priority}
-'''
-        networks.append(new_network)
-        if not write_wpa_config(networks):return jsonify({'success':False,'message':'Failed to write config'})
+        wpa.add_network(ssid,psk,priority)
         return jsonify({'success':True,'message':f'Network {ssid} added!'})
     except Exception as e:return jsonify({'success':False,'message':str(e)})
 
@@ -689,10 +915,8 @@ def wifi_edit():
         net_id=int(d.get('network_id',0))
         new_psk=d.get('psk','')
         if not new_psk:return jsonify({'success':False,'message':'Password required'})
-        networks=read_wpa_networks()
-        if net_id>=len(networks):return jsonify({'success':False,'message':'Network not found'})
-        networks[net_id]=re.sub(r'psk="[^"]*"',f'psk="{new_psk}"',networks[net_id])
-        if not write_wpa_config(networks):return jsonify({'success':False,'message':'Failed to write config'})
+        if not wpa_network_exists(net_id):return jsonify({'success':False,'message':'Network not found'})
+        wpa.update_network(net_id,psk=new_psk)
         return jsonify({'success':True,'message':'Password updated!'})
     except Exception as e:return jsonify({'success':False,'message':str(e)})
 
@@ -701,75 +925,86 @@ def wifi_delete():
     try:
         d=request.json
         net_id=int(d.get('network_id',0))
-        networks=read_wpa_networks()
-        if net_id>=len(networks):return jsonify({'success':False,'message':'Network not found'})
-        del networks[net_id]
-        if not write_wpa_config(networks):return jsonify({'success':False,'message':'Failed to write config'})
+        if not wpa_network_exists(net_id):return jsonify({'success':False,'message':'Network not found'})
+        wpa.remove_network(net_id)
         return jsonify({'success':True,'message':'Network deleted!'})
     except Exception as e:return jsonify({'success':False,'message':str(e)})
 
-@app.route('/api/hfss/register',methods=['POST'])
-def hfss_register():
+@app.route('/api/wifi/scan',methods=['GET','POST'])
+def wifi_scan():
+    """POST starts a scan; GET returns the latest scan results"""
     try:
-        d=request.json
-        config = read_config()
-        status = get_station_status()
-
-        token = generate_registration_token(
-            d['station_id'],
-            "OGN",
-            d['manufacturer_secret']
-        )
-
-        payload = {
-            "device_id": d['station_id'],
-            "manufacturer": "OGN",
-            "registration_token": token,
-            "name": d['station_name'],
-            "device_info": {
-                "custom_data": {
-                    "latitude": config.get('latitude', 0.0),
-                    "longitude": config.get('longitude', 0.0),
-                    "altitude": config.get('altitude', 0),
-                    "is_station": True,
-                    "station_type": "OGN_RECEIVER",
-                    "raspberry_pi": True,
-                    "callsign": config.get('call', 'NOCALL'),
-                    "vpn_ip": status.get("vpn_ip"),
-                    "api_endpoint": f"http://{status.get('vpn_ip')}:8082" if status.get('vpn_ip') else None,
-                    "ogn_web_ui": f"http://{status.get('vpn_ip')}:8080" if status.get('vpn_ip') else None,
-                    "registered_at": status.get("timestamp")
-                }
+        if request.method=='POST':
+            wpa.scan()
+            return jsonify({'success':True,'message':'Scan started'})
+        return jsonify({'success':True,'networks':wpa.scan_results()})
+    except Exception as e:return jsonify({'success':False,'message':str(e),'networks':[]})
+
+def register_device(d):
+    """Register this station with Alpium and start the heartbeat, returns (success, message)"""
+    import requests
+    config = read_config()
+    status = get_station_status()
+
+    token = generate_registration_token(
+        d['station_id'],
+        "OGN",
+        d['manufacturer_secret']
+    )
+
+    payload = {
+        "device_id": d['station_id'],
+        "manufacturer": "OGN",
+        "registration_token": token,
+        "name": d['station_name'],
+        "device_info": {
+            "custom_data": {
+                "latitude": config.get('latitude', 0.0),
+                "longitude": config.get('longitude', 0.0),
+                "altitude": config.get('altitude', 0),
+                "is_station": True,
+                "station_type": "OGN_RECEIVER",
+                "raspberry_pi": True,
+                "callsign": config.get('call', 'NOCALL'),
+                "vpn_ip": status.get("vpn_ip"),
+                "api_endpoint": f"http://{status.get('vpn_ip')}:8082" if status.get('vpn_ip') else None,
+                "ogn_web_ui": f"http://{status.get('vpn_ip')}:8080" if status.get('vpn_ip') else None,
+                "registered_at": status.get("timestamp")
             }
         }
+    }
 
-        response = requests.post(
-            f"{d['server_url']}/devices/register",
-            headers=get_cloudflare_headers(),
-            json=payload,
-            timeout=30
-        )
-
-        if response.status_code == 200:
-            data = response.json()
-            creds = {
-                "device_id": data["device_id"],
-                "api_key": data["api_key"],
-                "mqtt_username": data["mqtt_username"],
-                "mqtt_password": data["mqtt_password"],
-                "server_url": d['server_url'],
-                "registered_at": datetime.utcnow().isoformat(),
-                "last_heartbeat": None
-            }
+    response = requests.post(
+        f"{d['server_url']}/devices/register",
+        headers=get_cloudflare_headers(),
+        json=payload,
+        timeout=30
+    )
+
+    if response.status_code == 200:
+        data = response.json()
+        creds = {
+            "device_id": data["device_id"],
+            "api_key": data["api_key"],
+            "mqtt_username": data["mqtt_username"],
+            "mqtt_password": data["mqtt_password"],
+            "server_url": d['server_url'],
+            "registered_at": datetime.utcnow().isoformat(),
+            "last_heartbeat": None
+        }
 
-            if not save_credentials(creds):
-                return jsonify({'success':False,'message':'Failed to save credentials'})
+        if not save_credentials(creds):
+            return False, 'Failed to save credentials'
 
-            start_heartbeat()
-            return jsonify({'success':True,'message':'Registered successfully! Heartbeat started.'})
-        else:
-            return jsonify({'success':False,'message':f'Registration failed: {response.text}'})
+        start_heartbeat()
+        return True, 'Registered successfully! Heartbeat started.'
+    return False, f'Registration failed: {response.text}'
 
+@app.route('/api/hfss/register',methods=['POST'])
+def hfss_register():
+    try:
+        success, message = register_device(request.json)
+        return jsonify({'success':success,'message':message})
     except Exception as e:
         return jsonify({'success':False,'message':str(e)})
 
@@ -786,77 +1021,213 @@ def hfss_unregister():
 @app.route('/api/hfss/heartbeat-logs')
 def heartbeat_logs():
     try:
-        return jsonify({'success':True,'logs':heartbeat_history})
+        details = request.args.get('details', '1') != '0'
+        return jsonify({'success':True,'logs':heartbeat_history.snapshot(details)})
     except Exception as e:
         return jsonify({'success':False,'message':str(e),'logs':[]})
 
-@app.route('/api/health')
-def health():
-    """Health check endpoint with station status"""
+@app.route('/api/calibration/start',methods=['POST'])
+def calibration_start():
+    """Sweep the OGN gain, then apply (apply=true) or just recommend the best Gain/FreqCorr"""
+    global calibration_job
+    import rf_calibration  # pulls in ogn_capture (gzip, selectors, ...), only needed here
     try:
-        config = read_config()
-        status = get_station_status()
-        wifi = get_wifi_status()
-        hfss = get_hfss_status()
-
-        return jsonify({
-            'status': 'ok',
-            'timestamp': status['timestamp'],
-            'station': {
-                'callsign': config.get('call', 'NOCALL'),
-                'location': {
-                    'latitude': config.get('latitude', 0.0),
-                    'longitude': config.get('longitude', 0.0),
-                    'altitude': config.get('altitude', 0)
-                },
-                'vpn_ip': status.get('vpn_ip'),
-                'local_ip': get_ip()
-            },
-            'system': {
-                'cpu_temp': status.get('cpu_temp'),
-                'uptime': status.get('uptime'),
-                'disk_usage_percent': status.get('disk_usage_percent'),
-                'memory_usage_percent': status.get('memory_usage_percent')
-            },
-            'ogn': {
-                'status': status.get('ogn_status', 'unknown'),
-                'rf_running': status.get('ogn_rf_running'),
-                'decode_running': status.get('ogn_decode_running'),
-                'web_ui': f"http://{status.get('vpn_ip')}:8080" if status.get('vpn_ip') else f"http://{get_ip()}:8080"
-            },
-            'hfss': {
-                'registered': hfss['is_registered'],
-                'heartbeat_running': hfss['heartbeat_status'] == 'Running',
-                'last_heartbeat': hfss.get('last_heartbeat', 'Never')
+        if calibration_job and calibration_job.is_running():
+            return jsonify({'success':False,'message':'Calibration already running'})
+        d=request.json or {}
+        gains=[float(g) for g in d.get('gains') or rf_calibration.DEFAULT_GAINS]
+        window=int(d.get('window', rf_calibration.DEFAULT_WINDOW))
+        if window<=0:return jsonify({'success':False,'message':'Invalid window'})
+        if any(g<=0 for g in gains):return jsonify({'success':False,'message':'Invalid gain'})
+        apply=bool(d.get('apply', False))
+        receiver=get_receiver(d.get('receiver'))
+        original=read_config(receiver)
+
+        def finish(result):
+            config=read_config(receiver)
+            if apply and result and result['gain'] is not None:
+                config['gain']=result['gain']
+                if result['freqcorr'] is not None:
+                    config['freqcorr']=result['freqcorr']
+                print(f"Calibration applied: Gain={config['gain']} FreqCorr={config['freqcorr']}")
+            else:
+                config['gain']=original['gain']
+            write_config(config,receiver)
+            restart_receiver(receiver)
+
+        calibration_job=rf_calibration.CalibrationJob(
+            gains, lambda gain: set_receiver_gain(gain, receiver), original['centerfreq'], original['freqcorr'],
+            window_s=window, ports={'rf':receiver['rf_port'],'aprs':receiver['decode_port']},
+            capture_path=CALIBRATION_CAPTURE_FILE, on_done=finish)
+        calibration_job.start()
+        minutes=round(len(gains)*(window+rf_calibration.DEFAULT_SETTLE)/60)
+        return jsonify({'success':True,'message':f"Calibration of {receiver['name']} started, about {minutes} min"})
+    except Exception as e:return jsonify({'success':False,'message':str(e)})
+
+@app.route('/api/calibration/status')
+def calibration_status():
+    if not calibration_job:
+        return jsonify({'success':True,'state':'idle'})
+    return jsonify({'success':True,**calibration_job.status()})
+
+@app.route('/api/calibration/cancel',methods=['POST'])
+def calibration_cancel():
+    if not calibration_job or not calibration_job.is_running():
+        return jsonify({'success':False,'message':'No calibration running'})
+    calibration_job.cancel()
+    return jsonify({'success':True,'message':'Calibration cancelled, restoring settings'})
+
+@app.route('/api/rf')
+def rf():
+    """Rolling noise floor, interference bursts and slot occupancy from the ogn-rf stream"""
+    if rf_analysis_error:
+        return jsonify({'success':False,'message':f'{rf_analysis_error} (is python3-numpy installed?)','receivers':{}})
+    analyzers=dict(rf_analyzers)
+    name=request.args.get('receiver')
+    if name and name not in analyzers:
+        starting=any(r['name']==name for r in load_receivers())
+        return jsonify({'success':False,'message':f'RF analysis of {name} is starting' if starting else f'Unknown receiver {name}','receivers':{}})
+    if not analyzers:
+        return jsonify({'success':False,'message':'RF analysis is starting','receivers':{}})
+    return jsonify({'success':True,'receivers':{n:a.snapshot() for n,a in analyzers.items() if not name or n==name}})
+
+@app.route('/api/uplink')
+def uplink():
+    """Per-interface probe health, active uplink and recent failovers"""
+    if not uplink_monitor:
+        return jsonify({'success':False,'message':'Uplink monitor not running'})
+    return jsonify({'success':True,**uplink_monitor.snapshot()})
+
+def build_health():
+    """Full station status; runs pgrep/ip/tailscale and port probes, so only the refresher calls it"""
+    config = read_config()
+    status = get_station_status()
+    wifi = get_wifi_status()
+    hfss = get_hfss_status()
+    receivers, reception = get_receivers_status()
+    local_ip = get_ip()
+
+    return {
+        'status': 'ok',
+        'timestamp': status['timestamp'],
+        'station': {
+            'callsign': config.get('call', 'NOCALL'),
+            'location': {
+                'latitude': config.get('latitude', 0.0),
+                'longitude': config.get('longitude', 0.0),
+                'altitude': config.get('altitude', 0)
             },
-            'network': {
-                'wlan0': wifi['wlan0_status'],
-                'eth1': wifi['eth1_status']
-            }
-        })
+            'vpn_ip': status.get('vpn_ip'),
+            'local_ip': local_ip
+        },
+        'system': {
+            'cpu_temp': status.get('cpu_temp'),
+            'uptime': status.get('uptime'),
+            'disk_usage_percent': status.get('disk_usage_percent'),
+            'memory_usage_percent': status.get('memory_usage_percent')
+        },
+        'ogn': {
+            'status': status.get('ogn_status', 'unknown'),
+            'rf_running': status.get('ogn_rf_running'),
+            'decode_running': status.get('ogn_decode_running'),
+            'web_ui': f"http://{status.get('vpn_ip')}:8080" if status.get('vpn_ip') else f"http://{local_ip}:8080",
+            'receivers': receivers,
+            'reception': reception,
+            'rf': get_rf_summary()
+        },
+        'hfss': {
+            'registered': hfss['is_registered'],
+            'heartbeat_running': hfss['heartbeat_status'] == 'Running',
+            'last_heartbeat': hfss.get('last_heartbeat', 'Never')
+        },
+        'network': {
+            'uplink': uplink_monitor.snapshot()['active'] if uplink_monitor else None,
+            'wlan0': wifi['wlan0_status'],
+            'wlan0_ssid': wifi['wlan0_ssid'],
+            'wlan0_signal': wifi['wlan0_signal'],
+            'eth1': wifi['eth1_status']
+        }
+    }
+
+def refresh_health():
+    try:
+        health_cache['body'] = build_health()
     except Exception as e:
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        health_cache['body'] = {'status': 'error', 'message': str(e)}
+    health_cache['updated'] = time.monotonic()
 
-if __name__=='__main__':
-    # Load heartbeat history
-    load_heartbeat_history()
+def health_refresher():
+    """Rebuild the /api/health body in the background so the endpoint never waits on subprocesses"""
+    server_ready.wait(10)  # don't compete with startup for the CPU
+    while True:
+        refresh_health()
+        time.sleep(HEALTH_REFRESH_INTERVAL)
 
-    # Auto-register if not already registered
-    if not load_credentials():
-        print("Device not registered. Attempting auto-registration...")
+@app.route('/api/health')
+def health():
+    """Health check endpoint with station status, served from the background refresher's cache"""
+    body = health_cache['body']
+    if body is None:
+        # Listening but the first refresh hasn't finished: answer liveness only
+        return jsonify({'status': 'starting', 'timestamp': datetime.utcnow().isoformat(), 'startup': startup_stats})
+    age = round(time.monotonic() - health_cache['updated'], 1)
+    return jsonify({**body, 'age_s': age, 'startup': startup_stats}), 500 if body['status'] == 'error' else 200
+
+def auto_register_worker():
+    """Register in the background with the .env defaults, retrying with backoff"""
+    attempt = 0
+    while not load_credentials():
+        d = get_default_hfss_config()
+        if not d['manufacturer_secret']:
+            print("Auto-registration skipped: no MANUFACTURER_SECRET_OGN in .env")
+            return
         try:
-            # Call registration endpoint
-            response = hfss_register()
-            if response[1] == 200:
-                print("Auto-registration successful!")
-                # Credentials are now saved, start heartbeat
-                start_heartbeat()
-            else:
-                print(f"Auto-registration failed: {response[0].get_json()}")
+            success, message = register_device(d)
         except Exception as e:
-            print(f"Auto-registration error: {e}")
-    else:
-        # Already registered, start heartbeat
-        start_heartbeat()
+            success, message = False, str(e)
+        if success:
+            print("Auto-registration successful!")
+            return
+        delay = REGISTRATION_RETRY_DELAYS[min(attempt, len(REGISTRATION_RETRY_DELAYS) - 1)]
+        print(f"Auto-registration failed: {message} (retrying in {delay}s)")
+        attempt += 1
+        time.sleep(delay)
+
+def measure_startup():
+    """Time from module import to the first byte of /api/health served by this process.
+
+    The health body is served from a cache, so this measures the server listening
+    and answering, not the cost of collecting station status.
+    """
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', HTTP_PORT), timeout=5) as sock:
+                sock.sendall(b'GET /api/health HTTP/1.0\r\nHost: localhost\r\n\r\n')
+                if sock.recv(1):
+                    startup_stats['first_byte_ms'] = round((time.monotonic() - START_TIME) * 1000)
+                    print(f"Startup: first byte served {startup_stats['first_byte_ms']} ms after import")
+                    server_ready.set()
+                    return
+        except OSError:
+            time.sleep(0.02)
 
-    app.run(host='0.0.0.0',port=8082,debug=False)
+if __name__=='__main__':
+    # Heartbeat history is only needed by /api/hfss/heartbeat-logs, load it off the startup path
+    threading.Thread(target=load_heartbeat_history, daemon=True).start()
+
+    if load_credentials():
+        start_heartbeat()
+    else:
+        # Registration can block for up to 30s, never hold up the HTTP server for it
+        print("Device not registered. Attempting auto-registration in background...")
+        threading.Thread(target=auto_register_worker, daemon=True).start()
+
+    start_uplink_monitor()
+    start_reception_stats()
+    start_rf_analyzers()
+
+    startup_stats['ready_ms'] = round((time.monotonic() - START_TIME) * 1000)
+    threading.Thread(target=measure_startup, daemon=True).start()
+    threading.Thread(target=health_refresher, daemon=True).start()
+    app.run(host='0.0.0.0',port=HTTP_PORT,debug=False)
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+OGN Stream Capture
+Record the ogn-rf (50000) and ogn-decode (50001) telnet streams to a compact
+timestamped capture file, replay it on local ports, and benchmark consumers.
+
+Capture format (gzip text):
+    #OGNCAP 1 <start unix time>
+    <offset ms>\t<stream>\t<line>
+"""
+import argparse
+import collections
+import gzip
+import importlib
+import os
+import selectors
+import socket
+import threading
+import time
+
+CAPTURE_MAGIC = '#OGNCAP'
+CAPTURE_VERSION = 1
+
+# Stream name -> default telnet port / log file
+STREAMS = {'rf': 50000, 'aprs': 50001}
+LOG_DIR = '/var/log/rtlsdr-ogn'
+
+
+class CaptureWriter:
+    """Append timestamped stream lines to a gzip capture file"""
+
+    def __init__(self, path, start=None):
+        self.start = start if start is not None else time.time()
+        self.lines = 0
+        self._lock = threading.Lock()
+        self._f = gzip.open(path, 'wt', encoding='utf-8', newline='\n')
+        self._f.write(f'{CAPTURE_MAGIC} {CAPTURE_VERSION} {self.start:.3f}\n')
+
+    def write(self, stream, text, ts=None):
+        ts = time.time() if ts is None else ts
+        offset_ms = max(0, int(round((ts - self.start) * 1000)))
+        text = text.rstrip('\r\n').replace('\t', ' ')
+        with self._lock:
+            self._f.write(f'{offset_ms}\t{stream}\t{text}\n')
+            self.lines += 1
+
+    def close(self):
+        with self._lock:
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_capture(path):
+    """Yield (offset_seconds, stream, text) tuples from a capture file"""
+    with gzip.open(path, 'rt', encoding='utf-8', newline='\n') as f:
+        header = f.readline().split()
+        if len(header) < 3 or header[0] != CAPTURE_MAGIC:
+            raise ValueError(f'{path}: not an OGN capture file')
+        if int(header[1]) != CAPTURE_VERSION:
+            raise ValueError(f'{path}: unsupported capture version {header[1]}')
+        for line in f:
+            parts = line.rstrip('\n').split('\t', 2)
+            if len(parts) != 3:
+                continue
+            yield int(parts[0]) / 1000.0, parts[1], parts[2]
+
+
+def capture_start_time(path):
+    """Unix time at which a capture was started"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        header = f.readline().split()
+    return float(header[2])
+
+
+def _split_lines(buf):
+    """Split complete lines off a bytes buffer, return (lines, remainder)"""
+    *lines, rest = buf.split(b'\n')
+    return [l.decode('utf-8', 'replace').rstrip('\r') for l in lines], rest
+
+
+def record_telnet(writer, host='localhost', ports=None, duration=None, stop_event=None):
+    """Record the telnet streams until duration elapses or stop_event is set"""
+    ports = ports or STREAMS
+    sel = selectors.DefaultSelector()
+    buffers = {}
+    for stream, port in ports.items():
+        sock = socket.create_connection((host, port), timeout=5)
+        sock.setblocking(False)
+        sel.register(sock, selectors.EVENT_READ, stream)
+        buffers[stream] = b''
+    deadline = time.monotonic() + duration if duration else None
+    try:
+        while sel.get_map():
+            if stop_event is not None and stop_event.is_set():
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            for key, _ in sel.select(timeout=0.5):
+                stream = key.data
+                chunk = key.fileobj.recv(65536)
+                if not chunk:
+                    sel.unregister(key.fileobj)
+                    key.fileobj.close()
+                    continue
+                now = time.time()
+                lines, buffers[stream] = _split_lines(buffers[stream] + chunk)
+                for line in lines:
+                    writer.write(stream, line, now)
+    finally:
+        for key in list(sel.get_map().values()):
+            key.fileobj.close()
+        sel.close()
+
+
+def _check_rotated(f, path):
+    """Return (file to keep reading, True if it restarted) after truncation or rotation"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return f, False  # mid-rotation, the new file is not there yet
+    if st.st_ino != os.fstat(f.fileno()).st_ino:
+        f.close()
+        return open(path, 'rb'), True  # rotated: read the new file from the start
+    if os.fstat(f.fileno()).st_size < f.tell():
+        f.seek(0)  # truncated in place (copytruncate)
+        return f, True
+    return f, False
+
+
+def record_logs(writer, log_dir=LOG_DIR, duration=None, stop_event=None):
+    """Follow the rtlsdr-ogn log files, recording lines as they are appended.
+
+    Like `tail -F`, files are reopened when logrotate replaces them and re-read
+    from the start when they are truncated in place.
+    """
+    paths = {}
+    files = {}
+    buffers = {}
+    for stream, port in STREAMS.items():
+        paths[stream] = os.path.join(log_dir, str(port))
+        f = open(paths[stream], 'rb')
+        f.seek(0, os.SEEK_END)
+        files[stream] = f
+        buffers[stream] = b''
+    deadline = time.monotonic() + duration if duration else None
+    try:
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            idle = True
+            for stream in files:
+                chunk = files[stream].read()
+                if not chunk:
+                    files[stream], restarted = _check_rotated(files[stream], paths[stream])
+                    if not restarted:
+                        continue
+                    buffers[stream] = b''
+                    chunk = files[stream].read()
+                    if not chunk:
+                        continue
+                idle = False
+                now = time.time()
+                lines, buffers[stream] = _split_lines(buffers[stream] + chunk)
+                for line in lines:
+                    writer.write(stream, line, now)
+            if idle:
+                if stop_event is not None:
+                    stop_event.wait(0.2)
+                else:
+                    time.sleep(0.2)
+    finally:
+        for f in files.values():
+            f.close()
+
+
+class ReplayServer:
+    """Serve a capture on local TCP ports, one per stream.
+
+    speed is a time multiplier (1 = real time, N = N times faster, 0 = as fast
+    as possible). Every connected client of a stream receives its lines.
+    on_send(stream, due) is called for each line sent, with the monotonic time
+    at which the line was due according to the capture timestamps.
+    """
+
+    def __init__(self, path, speed=1.0, host='127.0.0.1', ports=None, on_send=None):
+        self.path = path
+        self.speed = speed
+        self.on_send = on_send
+        self.sent = 0
+        self._clients = collections.defaultdict(list)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._listeners = {}
+        for stream, port in (ports if ports is not None else STREAMS).items():
+            srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            srv.bind((host, port))
+            srv.listen(8)
+            self._listeners[stream] = srv
+            threading.Thread(target=self._accept, args=(stream, srv), daemon=True).start()
+
+    @property
+    def ports(self):
+        return {stream: srv.getsockname()[1] for stream, srv in self._listeners.items()}
+
+    def _accept(self, stream, srv):
+        while not self._stop.is_set():
+            try:
+                conn, _ = srv.accept()
+            except OSError:
+                break
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with self._lock:
+                self._clients[stream].append(conn)
+
+    def client_count(self):
+        with self._lock:
+            return sum(len(c) for c in self._clients.values())
+
+    def wait_for_clients(self, count=1, timeout=None):
+        deadline = time.monotonic() + timeout if timeout else None
+        while self.client_count() < count:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _send(self, stream, data):
+        with self._lock:
+            clients = list(self._clients.get(stream, ()))
+        for conn in clients:
+            try:
+                conn.sendall(data)
+            except OSError:
+                with self._lock:
+                    if conn in self._clients[stream]:
+                        self._clients[stream].remove(conn)
+                conn.close()
+
+    def play(self):
+        """Replay the capture once, blocking until done or stopped"""
+        t0 = time.monotonic()
+        for offset, stream, text in read_capture(self.path):
+            if self._stop.is_set():
+                break
+            if stream not in self._listeners:
+                continue
+            if self.speed > 0:
+                due = t0 + offset / self.speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                due = time.monotonic()
+            if self.on_send:
+                self.on_send(stream, due)
+            self._send(stream, (text + '\n').encode('utf-8'))
+            self.sent += 1
+
+    def close(self):
+        self._stop.set()
+        for srv in self._listeners.values():
+            srv.close()
+        with self._lock:
+            for clients in self._clients.values():
+                for conn in clients:
+                    conn.close()
+            self._clients.clear()
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def benchmark(path, consumer=None, speed=0):
+    """Replay a capture through local sockets into consumer(stream, line).
+
+    Returns lines/s and end-to-end latency (ms) from each line's capture
+    timestamp (mapped onto the replay clock) to the end of its processing.
+    """
+    consumer = consumer or (lambda stream, line: None)
+    due_times = collections.defaultdict(collections.deque)
+    latencies = []
+    lat_lock = threading.Lock()
+    server = ReplayServer(path, speed=speed, ports={s: 0 for s in STREAMS},
+                          on_send=lambda stream, due: due_times[stream].append(due))
+
+    def read_stream(stream, port):
+        with socket.create_connection(('127.0.0.1', port)) as sock:
+            ready.release()
+            buf = b''
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                lines, buf = _split_lines(buf + chunk)
+                for line in lines:
+                    consumer(stream, line)
+                    done = time.monotonic()
+                    due = due_times[stream].popleft()
+                    with lat_lock:
+                        latencies.append(done - due)
+
+    ready = threading.Semaphore(0)
+    readers = [threading.Thread(target=read_stream, args=item, daemon=True)
+               for item in server.ports.items()]
+    for t in readers:
+        t.start()
+    for _ in readers:
+        ready.acquire()
+    server.wait_for_clients(len(readers))
+
+    t0 = time.monotonic()
+    server.play()
+    server.close()
+    for t in readers:
+        t.join()
+    elapsed = time.monotonic() - t0
+
+    latencies.sort()
+    ms = lambda v: round(v * 1000.0, 3) if v is not None else None
+    return {
+        'lines': len(latencies),
+        'elapsed_s': round(elapsed, 3),
+        'lines_per_s': round(len(latencies) / elapsed, 1) if elapsed > 0 else None,
+        'latency_ms': {
+            'p50': ms(_percentile(latencies, 50)),
+            'p95': ms(_percentile(latencies, 95)),
+            'p99': ms(_percentile(latencies, 99)),
+            'max': ms(latencies[-1] if latencies else None),
+        },
+    }
+
+
+def load_consumer(spec):
+    """Resolve a 'module:function' consumer spec"""
+    module_name, _, func_name = spec.partition(':')
+    return getattr(importlib.import_module(module_name), func_name or 'consume')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record, replay and benchmark OGN telnet streams')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help='Record the live streams to a capture file')
+    rec.add_argument('output')
+    rec.add_argument('--host', default='localhost')
+    rec.add_argument('--from-logs', action='store_true', help=f'Follow the log files in {LOG_DIR} instead of telnet')
+    rec.add_argument('--duration', type=float, help='Seconds to record (default: until Ctrl-C)')
+
+    rep = sub.add_parser('replay', help='Serve a capture on the local telnet ports')
+    rep.add_argument('capture')
+    rep.add_argument('--speed', type=float, default=1.0, help='Time multiplier, 0 = maximum speed')
+    rep.add_argument('--rf-port', type=int, default=STREAMS['rf'])
+    rep.add_argument('--aprs-port', type=int, default=STREAMS['aprs'])
+    rep.add_argument('--loop', action='store_true')
+
+    ben = sub.add_parser('bench', help='Benchmark a consumer against a capture')
+    ben.add_argument('capture')
+    ben.add_argument('--speed', type=float, default=0, help='Time multiplier, 0 = maximum speed')
+    ben.add_argument('--consumer', help="Consumer as 'module:function', called with (stream, line)")
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        with CaptureWriter(args.output) as writer:
+            try:
+                if args.from_logs:
+                    record_logs(writer, duration=args.duration)
+                else:
+                    record_telnet(writer, host=args.host, duration=args.duration)
+            except KeyboardInterrupt:
+                pass
+            print(f"Recorded {writer.lines} lines to {args.output}")
+
+    elif args.command == 'replay':
+        server = ReplayServer(args.capture, speed=args.speed,
+                              ports={'rf': args.rf_port, 'aprs': args.aprs_port})
+        print(f"Serving {args.capture} on {server.ports} at {args.speed or 'max'}x, waiting for a client...")
+        try:
+            server.wait_for_clients()
+            while True:
+                server.play()
+                if not args.loop:
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+        print(f"Replayed {server.sent} lines")
+
+    elif args.command == 'bench':
+        consumer = load_consumer(args.consumer) if args.consumer else None
+        result = benchmark(args.capture, consumer, speed=args.speed)
+        print(f"{result['lines']} lines in {result['elapsed_s']}s = {result['lines_per_s']} lines/s")
+        lat = result['latency_ms']
+        print(f"Latency ms: p50={lat['p50']} p95={lat['p95']} p99={lat['p99']} max={lat['max']}")
+
+
+if __name__ == '__main__':
+    main()
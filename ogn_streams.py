@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+OGN Stream Parsers
+Incremental, line-at-a-time parsers for the ogn-rf (telnet 50000) and
+ogn-decode (telnet 50001) output. Both are tolerant: lines that don't carry the
+fields of interest return None, so they can be fed the raw streams directly.
+"""
+import collections
+import re
+import socket
+import time
+
+# ogn-decode position lines, e.g.
+#   0.240sec:868.394MHz: 1:2:DD8F1C 103017: [ +46.12345, +8.12345]deg 1234m ... + 9.5dB +2.36kHz 0e
+# and APRS beacons, e.g.
+#   FLRDD8F1C>OGFLR,qAS,Station:/103017h4612.34N/00812.34E'342/049/A=004049 !W46! id06DD8F1C ... 5.5dB 3e -4.3kHz
+DECODE_ID_RE = re.compile(r'\b\d:\d:([0-9A-F]{6})\b|\bid[0-9A-F]{2}([0-9A-F]{6})\b')
+DECODE_TIME_RE = re.compile(r'\b(\d{6})(?::|h)')
+SNR_RE = re.compile(r'(?<![\w.])([+-]?\s?\d+(?:\.\d+)?)dB\b')
+FREQ_ERR_RE = re.compile(r'(?<![\w.])([+-]?\d+(?:\.\d+)?)kHz\b')
+BIT_ERR_RE = re.compile(r'(?<![\w.])(\d+)e\b')
+
+# ogn-rf status lines carry the receiver frequency, gain and noise level, e.g.
+#   868.200MHz Gain=40.0dB Noise=-27.5dB Signals=3
+# Field order and separators vary between releases, so each field is matched on its own.
+RF_FREQ_RE = re.compile(r'(\d{3,4}\.\d+)\s*MHz')
+RF_GAIN_RE = re.compile(r'Gain\s*[:=]?\s*([+-]?\d+(?:\.\d+)?)\s*dB', re.I)
+RF_NOISE_RE = re.compile(r'Noise\s*[:=]?\s*([+-]?\d+(?:\.\d+)?)\s*dB', re.I)
+RF_NOISE_SUFFIX_RE = re.compile(r'([+-]?\d+(?:\.\d+)?)\s*dB\s*noise', re.I)
+RF_SIGNALS_RE = re.compile(r'Signals?\s*[:=]\s*(\d+)|(\d+)\s*signals?\b', re.I)
+
+DecodeRecord = collections.namedtuple('DecodeRecord', 'aircraft fix_time snr_db freq_err_khz bit_errors')
+RfRecord = collections.namedtuple('RfRecord', 'freq_mhz gain_db noise_db signals')
+
+
+def _number(text):
+    return float(text.replace(' ', ''))
+
+
+def parse_decode_line(line):
+    """Parse an ogn-decode position/beacon line into a DecodeRecord, or None"""
+    m = DECODE_ID_RE.search(line)
+    if not m:
+        return None
+    snr = SNR_RE.findall(line)
+    freq = FREQ_ERR_RE.findall(line)
+    errors = BIT_ERR_RE.findall(line)
+    fix = DECODE_TIME_RE.search(line)
+    return DecodeRecord(
+        aircraft=m.group(1) or m.group(2),
+        fix_time=fix.group(1) if fix else None,
+        snr_db=_number(snr[-1]) if snr else None,
+        freq_err_khz=_number(freq[-1]) if freq else None,
+        bit_errors=int(errors[-1]) if errors else None
+    )
+
+
+def parse_rf_line(line):
+    """Parse an ogn-rf status line into an RfRecord, or None if it has no RF fields"""
+    noise = RF_NOISE_RE.search(line) or RF_NOISE_SUFFIX_RE.search(line)
+    gain = RF_GAIN_RE.search(line)
+    signals = RF_SIGNALS_RE.search(line)
+    if not (noise or gain or signals):
+        return None
+    freq = RF_FREQ_RE.search(line)
+    return RfRecord(
+        freq_mhz=float(freq.group(1)) if freq else None,
+        gain_db=float(gain.group(1)) if gain else None,
+        noise_db=float(noise.group(1)) if noise else None,
+        signals=int(signals.group(1) or signals.group(2)) if signals else None
+    )
+
+
+def follow_stream(host, port, on_line, stop_event, retry_s=5):
+    """Call on_line(line, ts) for every line of a telnet stream, reconnecting until stop_event is set"""
+    while not stop_event.is_set():
+        try:
+            with socket.create_connection((host, port), timeout=5) as sock:
+                sock.settimeout(1.0)
+                buf = b''
+                while not stop_event.is_set():
+                    try:
+                        chunk = sock.recv(65536)
+                    except socket.timeout:
+                        continue
+                    if not chunk:
+                        break
+                    *lines, buf = (buf + chunk).split(b'\n')
+                    now = time.time()
+                    for line in lines:
+                        on_line(line.decode('utf-8', 'replace').rstrip('\r'), now)
+        except OSError:
+            pass
+        stop_event.wait(retry_s)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Reception Statistics
+Rolling reception counts across all receiver instances. Two dongles hearing the
+same aircraft packet report the same aircraft ID and fix time, so each packet is
+counted once in the station totals while per-instance counts keep every decode.
+"""
+import collections
+import threading
+import time
+
+
+class ReceptionStats:
+    """Thread-safe rolling window of decoded positions with cross-instance de-duplication"""
+
+    def __init__(self, window_s=300, dedup_s=30):
+        self.window_s = window_s
+        self.dedup_s = dedup_s
+        self._lock = threading.Lock()
+        self._seen = collections.OrderedDict()  # (aircraft, fix) -> ts of first decode
+        self._unique = collections.deque()  # (ts, aircraft)
+        self._duplicates = collections.deque()  # ts
+        self._per_instance = collections.defaultdict(collections.deque)  # name -> (ts, aircraft)
+
+    def _expire(self, now):
+        while self._seen and next(iter(self._seen.values())) < now - self.dedup_s:
+            self._seen.popitem(last=False)
+        cutoff = now - self.window_s
+        while self._unique and self._unique[0][0] < cutoff:
+            self._unique.popleft()
+        while self._duplicates and self._duplicates[0] < cutoff:
+            self._duplicates.popleft()
+        for decodes in self._per_instance.values():
+            while decodes and decodes[0][0] < cutoff:
+                decodes.popleft()
+
+    def add(self, instance, record, ts=None):
+        """Count a DecodeRecord from instance; returns False if another instance already had it"""
+        ts = time.time() if ts is None else ts
+        key = (record.aircraft, record.fix_time or int(ts))
+        with self._lock:
+            self._expire(ts)
+            self._per_instance[instance].append((ts, record.aircraft))
+            if key in self._seen:
+                self._duplicates.append(ts)
+                return False
+            self._seen[key] = ts
+            self._unique.append((ts, record.aircraft))
+            return True
+
+    def snapshot(self, now=None):
+        now = time.time() if now is None else now
+        per_min = 60.0 / self.window_s
+        with self._lock:
+            self._expire(now)
+            return {
+                'window_s': self.window_s,
+                'positions_per_min': round(len(self._unique) * per_min, 1),
+                'aircraft': len({a for _, a in self._unique}),
+                'duplicates_per_min': round(len(self._duplicates) * per_min, 1),
+                'receivers': {
+                    name: {
+                        'positions_per_min': round(len(decodes) * per_min, 1),
+                        'aircraft': len({a for _, a in decodes})
+                    }
+                    for name, decodes in self._per_instance.items()
+                }
+            }
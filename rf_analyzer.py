@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+RF Stream Analyzer
+Turns the ogn-rf telnet stream (port 50000) into rolling statistics: noise floor
+over time, interference bursts above that floor, and signal slot occupancy.
+All state lives in fixed-size NumPy ring buffers, so memory stays constant no
+matter how long the station runs.
+
+The current floor is compared to a slow baseline built from per-minute floors
+that have already left the current floor window. Minutes that sit outside the
+LNA/interference thresholds are held out of it, so a lasting fault keeps its
+flag instead of becoming the new normal. A gain or frequency change starts a
+new baseline, since the noise level moves with it.
+"""
+import collections
+import threading
+import time
+
+from ogn_streams import parse_rf_line
+
+NOISE_SAMPLES = 3600  # ring of noise readings, ~1 hour at one status line per second
+OCCUPANCY_SECONDS = 600  # one-second slots tracked for occupancy
+FLOOR_SAMPLES = 300  # recent readings the current noise floor is estimated from
+FLOOR_PERCENTILE = 10  # floor = low percentile, so bursts don't drag it up
+BURST_MARGIN_DB = 6.0  # a reading this far above the floor is interference
+LNA_DROP_DB = 3.0  # floor this far below the baseline suggests a failing LNA
+INTERFERENCE_RISE_DB = 6.0  # floor this far above the baseline suggests a new local source
+BASELINE_MINUTES = 360  # time constant of the baseline, so slow (thermal, seasonal) drift is followed
+BASELINE_WARMUP = 10  # minutes averaged unconditionally before anomalous minutes are held out
+FLOOR_MINUTES = max(1, FLOOR_SAMPLES // 60)  # recent minute floors still inside the current floor window
+
+
+class RfAnalyzer:
+    """Incremental RF statistics for one receiver's ogn-rf stream"""
+
+    def __init__(self):
+        import numpy as np  # only needed once RF analysis runs
+        self._np = np
+        self._lock = threading.Lock()
+        self._ts = np.full(NOISE_SAMPLES, np.nan)
+        self._noise = np.full(NOISE_SAMPLES, np.nan, dtype=np.float32)
+        self._pos = 0
+        self._count = 0
+        self._slot_second = np.full(OCCUPANCY_SECONDS, -1, dtype=np.int64)
+        self._slot_signals = np.zeros(OCCUPANCY_SECONDS, dtype=np.int32)
+        self._floor = None
+        self._minute = None
+        self._minute_noise = []
+        self._pending_floors = collections.deque()  # minute floors not yet old enough for the baseline
+        self._baseline = None
+        self._baseline_minutes = 0
+        self._burst = None  # [start ts, peak dB] while a burst is in progress
+        self.bursts = collections.deque(maxlen=50)
+        self.gain_db = None
+        self.freq_mhz = None
+        self.lines = 0
+        self.last_update = None
+
+    def _recent(self, n):
+        """Last n noise readings (timestamps, values), oldest first"""
+        n = min(n, self._count)
+        idx = (self._pos - n + self._np.arange(n)) % NOISE_SAMPLES
+        return self._ts[idx], self._noise[idx]
+
+    def _update_floor(self):
+        _, noise = self._recent(FLOOR_SAMPLES)
+        self._floor = float(self._np.percentile(noise, FLOOR_PERCENTILE)) if len(noise) else None
+
+    def _close_minute(self):
+        if self._minute_noise:
+            self._pending_floors.append(float(self._np.percentile(self._minute_noise, FLOOR_PERCENTILE)))
+            self._minute_noise = []
+        while len(self._pending_floors) > FLOOR_MINUTES:
+            self._update_baseline(self._pending_floors.popleft())
+
+    def _update_baseline(self, floor):
+        if self._baseline_minutes < BASELINE_WARMUP:
+            self._baseline_minutes += 1
+            self._baseline = floor if self._baseline is None else \
+                self._baseline + (floor - self._baseline) / self._baseline_minutes
+        elif -LNA_DROP_DB < floor - self._baseline < INTERFERENCE_RISE_DB:
+            self._baseline += (floor - self._baseline) / BASELINE_MINUTES
+        # otherwise hold the baseline: the minute is part of the anomaly being flagged
+
+    def _reset_floor(self):
+        """Forget noise history and baseline; readings at another gain/frequency aren't comparable"""
+        self._ts.fill(self._np.nan)
+        self._noise.fill(self._np.nan)
+        self._pos = 0
+        self._count = 0
+        self._floor = None
+        self._minute = None
+        self._minute_noise = []
+        self._pending_floors.clear()
+        self._baseline = None
+        self._baseline_minutes = 0
+        self._burst = None
+
+    def feed(self, line, ts=None):
+        """Consume one raw line of the RF stream"""
+        rec = parse_rf_line(line)
+        if rec is None:
+            return
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            self.lines += 1
+            self.last_update = ts
+            changed = (rec.gain_db is not None and self.gain_db is not None and rec.gain_db != self.gain_db) or \
+                (rec.freq_mhz is not None and self.freq_mhz is not None and rec.freq_mhz != self.freq_mhz)
+            if changed:
+                self._reset_floor()
+            if rec.gain_db is not None:
+                self.gain_db = rec.gain_db
+            if rec.freq_mhz is not None:
+                self.freq_mhz = rec.freq_mhz
+            if rec.signals is not None:
+                second = int(ts)
+                slot = second % OCCUPANCY_SECONDS
+                if self._slot_second[slot] != second:
+                    self._slot_second[slot] = second
+                    self._slot_signals[slot] = 0
+                self._slot_signals[slot] += rec.signals
+            if rec.noise_db is not None:
+                self._ts[self._pos] = ts
+                self._noise[self._pos] = rec.noise_db
+                self._pos = (self._pos + 1) % NOISE_SAMPLES
+                self._count = min(self._count + 1, NOISE_SAMPLES)
+                minute = int(ts // 60)
+                if minute != self._minute:
+                    self._close_minute()
+                    self._minute = minute
+                self._minute_noise.append(rec.noise_db)
+                if self._floor is None or self._count % 10 == 0:
+                    self._update_floor()
+                self._track_burst(rec.noise_db, ts)
+
+    def _track_burst(self, noise_db, ts):
+        above = self._floor is not None and noise_db >= self._floor + BURST_MARGIN_DB
+        if above:
+            if self._burst is None:
+                self._burst = [ts, noise_db]
+            else:
+                self._burst[1] = max(self._burst[1], noise_db)
+        elif self._burst is not None:
+            start, peak = self._burst
+            self.bursts.append({
+                'start': start,
+                'duration_s': round(ts - start, 1),
+                'peak_db': round(peak, 1),
+                'above_floor_db': round(peak - self._floor, 1)
+            })
+            self._burst = None
+
+    def _occupancy(self, now, seconds):
+        second = int(now)
+        valid = (self._slot_second > second - seconds) & (self._slot_second <= second)
+        busy = valid & (self._slot_signals > 0)
+        return round(float(busy.sum()) / seconds, 3), int(self._slot_signals[valid].sum())
+
+    def snapshot(self, now=None):
+        np = self._np
+        now = time.time() if now is None else now
+        with self._lock:
+            ts, noise = self._recent(NOISE_SAMPLES)
+            occupancy_1m, signals_1m = self._occupancy(now, 60)
+            occupancy_10m, _ = self._occupancy(now, OCCUPANCY_SECONDS)
+            bursts = [b for b in self.bursts if b['start'] >= now - 3600]
+            burst_active = self._burst is not None
+            floor = self._floor
+            baseline = self._baseline
+            gain, freq, lines, last_update = self.gain_db, self.freq_mhz, self.lines, self.last_update
+
+        floor_per_min = []
+        if len(noise):
+            # Per-minute noise floor over the last hour for charts
+            minute = ((now - ts) // 60).astype(np.int64)
+            keep = (minute >= 0) & (minute < 60)
+            for m in range(59, -1, -1):
+                values = noise[keep & (minute == m)]
+                floor_per_min.append(round(float(np.percentile(values, FLOOR_PERCENTILE)), 1) if len(values) else None)
+
+        drift = round(floor - baseline, 1) if floor is not None and baseline is not None else None
+        return {
+            'frequency_mhz': freq,
+            'gain_db': gain,
+            'lines': lines,
+            'last_update': last_update,
+            'noise_db': round(float(noise[-1]), 1) if len(noise) else None,
+            'noise_floor_db': round(floor, 1) if floor is not None else None,
+            'noise_floor_baseline_db': round(baseline, 1) if baseline is not None else None,
+            'noise_floor_drift_db': drift,
+            'noise_floor_per_min': floor_per_min,
+            'occupancy_1m': occupancy_1m,
+            'occupancy_10m': occupancy_10m,
+            'signals_per_min': signals_1m,
+            'burst_active': burst_active,
+            'bursts_last_hour': len(bursts),
+            'bursts': bursts[-10:],
+            'lna_suspect': drift is not None and drift <= -LNA_DROP_DB,
+            'interference_suspect': burst_active or (drift is not None and drift >= INTERFERENCE_RISE_DB)
+        }
+
+    def summary(self, now=None):
+        """Compact subset for /api/health and the heartbeat"""
+        s = self.snapshot(now)
+        return {k: s[k] for k in ('noise_floor_db', 'noise_floor_drift_db', 'occupancy_10m',
+                                  'bursts_last_hour', 'lna_suspect', 'interference_suspect')}
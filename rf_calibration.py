@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+RF Calibration
+Steps the OGN gain through candidate values, measures decode rate, SNR and noise
+floor from the RF (50000) and APRS (50001) streams at each step, estimates the
+receiver's frequency drift from the decoded frequency errors and recommends the
+best Gain / FreqCorr. The analysis runs on live streams or on recorded captures.
+"""
+import argparse
+import collections
+import statistics
+import threading
+import time
+
+import ogn_capture
+from ogn_streams import parse_decode_line, parse_rf_line
+
+# R820T tuner gain steps (dB) covering the useful range for 868 MHz
+DEFAULT_GAINS = [20.7, 29.7, 32.8, 36.4, 40.2, 43.9, 48.0, 49.6]
+DEFAULT_WINDOW = 120  # seconds measured per gain step
+DEFAULT_SETTLE = 20  # seconds to let ogn-rf/ogn-decode come back after a restart
+GAIN_TOLERANCE = 0.95  # prefer a lower gain within 5% of the best decode rate
+MIN_PPM_AIRCRAFT = 3  # distinct transmitters needed before trusting a ppm estimate
+MARK_STREAM = 'mark'  # capture stream carrying "gain <dB>" step markers
+
+
+def _median(values):
+    return round(statistics.median(values), 2) if values else None
+
+
+class StepStats:
+    """Accumulates stream lines for one gain step; usable as a record_telnet sink"""
+
+    def __init__(self, gain=None):
+        self.gain = gain
+        self.first_ts = None
+        self.last_ts = None
+        self.positions = 0
+        self.snr = []
+        self.noise = []
+        self.bit_errors = []
+        self.freq_err = collections.defaultdict(list)  # aircraft -> kHz
+
+    def write(self, stream, line, ts=None):
+        ts = time.time() if ts is None else ts
+        if self.first_ts is None:
+            self.first_ts = ts
+        self.last_ts = ts
+        if stream == 'aprs':
+            rec = parse_decode_line(line)
+            if rec is None:
+                return
+            self.positions += 1
+            if rec.snr_db is not None:
+                self.snr.append(rec.snr_db)
+            if rec.bit_errors is not None:
+                self.bit_errors.append(rec.bit_errors)
+            if rec.freq_err_khz is not None:
+                self.freq_err[rec.aircraft].append(rec.freq_err_khz)
+        elif stream == 'rf':
+            rec = parse_rf_line(line)
+            if rec is not None and rec.noise_db is not None:
+                self.noise.append(rec.noise_db)
+
+    def decode_rate(self, window_s=None):
+        """Decoded positions per minute"""
+        duration = window_s or ((self.last_ts - self.first_ts) if self.first_ts is not None else 0)
+        return round(self.positions * 60.0 / duration, 2) if duration else 0.0
+
+    def summary(self, window_s=None):
+        return {
+            'gain': self.gain,
+            'positions': self.positions,
+            'aircraft': len(self.freq_err),
+            'decode_rate_per_min': self.decode_rate(window_s),
+            'snr_db_median': _median(self.snr),
+            'noise_db_median': _median(self.noise),
+            'bit_errors_mean': round(sum(self.bit_errors) / len(self.bit_errors), 2) if self.bit_errors else None
+        }
+
+
+def estimate_ppm(freq_errors, centerfreq_mhz):
+    """Estimate the receiver's residual frequency error in ppm.
+
+    freq_errors maps aircraft -> reported offsets (kHz). Each transmitter has its
+    own crystal error, so the per-aircraft medians are combined with a median to
+    cancel them out. Returns None with fewer than MIN_PPM_AIRCRAFT transmitters.
+    """
+    per_aircraft = [statistics.median(v) for v in freq_errors.values() if v]
+    if len(per_aircraft) < MIN_PPM_AIRCRAFT:
+        return None
+    offset_khz = statistics.median(per_aircraft)
+    spread_khz = statistics.median(abs(v - offset_khz) for v in per_aircraft)
+    return {
+        'ppm': round(offset_khz * 1000.0 / centerfreq_mhz, 2),
+        'spread_ppm': round(spread_khz * 1000.0 / centerfreq_mhz, 2),
+        'aircraft': len(per_aircraft)
+    }
+
+
+def recommend(steps, centerfreq_mhz, freqcorr, window_s=None):
+    """Pick the best gain and corrected FreqCorr from measured steps.
+
+    The gain is the lowest one whose decode rate is within GAIN_TOLERANCE of the
+    best (less front-end overload for the same range). Signals decoded with the
+    current FreqCorr still show the residual error, which is removed from it:
+    a receiver reading everything +x ppm high needs FreqCorr lowered by x.
+    """
+    summaries = [s.summary(window_s) for s in steps]
+    best_rate = max((s['decode_rate_per_min'] for s in summaries), default=0)
+    gain = None
+    if best_rate > 0:
+        good = [s for s in summaries if s['gain'] is not None and s['decode_rate_per_min'] >= GAIN_TOLERANCE * best_rate]
+        if good:
+            gain = min(good, key=lambda s: (s['gain'], -(s['snr_db_median'] or 0)))['gain']
+
+    pooled = collections.defaultdict(list)
+    for s in steps:
+        for aircraft, values in s.freq_err.items():
+            pooled[aircraft].extend(values)
+    drift = estimate_ppm(pooled, centerfreq_mhz)
+
+    return {
+        'steps': summaries,
+        'gain': gain,
+        'drift': drift,
+        'freqcorr': round(freqcorr - drift['ppm'], 1) if drift else None
+    }
+
+
+def read_capture_steps(path):
+    """Split a capture into StepStats at its 'gain <dB>' markers (one step if unmarked)"""
+    start = ogn_capture.capture_start_time(path)
+    steps = []
+    current = None
+    for offset, stream, text in ogn_capture.read_capture(path):
+        if stream == MARK_STREAM:
+            parts = text.split()
+            if len(parts) == 2 and parts[0] == 'gain':
+                current = StepStats(float(parts[1]))
+                steps.append(current)
+            continue
+        if current is None:
+            current = StepStats()
+            steps.append(current)
+        current.write(stream, text, start + offset)
+    return steps
+
+
+class _Tee:
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    def write(self, stream, line, ts=None):
+        for sink in self.sinks:
+            sink.write(stream, line, ts)
+
+
+class CalibrationJob:
+    """Background gain sweep against the live telnet streams.
+
+    set_gain(gain) must write the config and restart the receiver. on_done(result)
+    is called with the recommend() result (or None if cancelled/failed) so the
+    caller can apply it or restore the previous settings.
+    """
+
+    def __init__(self, gains, set_gain, centerfreq_mhz, freqcorr, window_s=DEFAULT_WINDOW,
+                 settle_s=DEFAULT_SETTLE, host='localhost', ports=None, capture_path=None, on_done=None):
+        if not window_s or window_s <= 0:
+            raise ValueError('window_s must be positive')  # record_telnet treats 0 as "forever"
+        if not gains or any(g <= 0 for g in gains):
+            raise ValueError('gains must be positive')
+        self.gains = list(gains)
+        self.set_gain = set_gain
+        self.centerfreq_mhz = centerfreq_mhz
+        self.freqcorr = freqcorr
+        self.window_s = window_s
+        self.settle_s = settle_s
+        self.host = host
+        self.ports = ports
+        self.capture_path = capture_path
+        self.on_done = on_done
+        self.steps = []
+        self.state = 'idle'
+        self.current_gain = None
+        self.result = None
+        self.error = None
+        self.started_at = None
+        self._cancel = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.state = 'running'
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _measure(self, sink):
+        """Record the streams for one window, retrying while the receiver comes back up"""
+        deadline = time.monotonic() + self.settle_s + 30
+        while not self._cancel.is_set():
+            try:
+                ogn_capture.record_telnet(sink, host=self.host, ports=self.ports,
+                                          duration=self.window_s, stop_event=self._cancel)
+                return
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise
+                self._cancel.wait(2)
+
+    def _run(self):
+        writer = ogn_capture.CaptureWriter(self.capture_path) if self.capture_path else None
+        try:
+            for gain in self.gains:
+                if self._cancel.is_set():
+                    break
+                self.current_gain = gain
+                self.set_gain(gain)
+                if self._cancel.wait(self.settle_s):
+                    break
+                stats = StepStats(gain)
+                if writer:
+                    writer.write(MARK_STREAM, f'gain {gain}')
+                self._measure(_Tee(stats, writer) if writer else stats)
+                self.steps.append(stats)
+            if self._cancel.is_set():
+                self.state = 'cancelled'
+            else:
+                self.result = recommend(self.steps, self.centerfreq_mhz, self.freqcorr, self.window_s)
+                self.state = 'done'
+        except Exception as e:
+            self.error = str(e)
+            self.state = 'failed'
+        finally:
+            self.current_gain = None
+            if writer:
+                writer.close()
+            if self.on_done:
+                try:
+                    self.on_done(self.result)
+                except Exception as e:
+                    self.error = f'{self.error or ""} on_done: {e}'.strip()
+
+    def status(self):
+        return {
+            'state': self.state,
+            'started_at': self.started_at,
+            'current_gain': self.current_gain,
+            'gains': self.gains,
+            'window_s': self.window_s,
+            'steps': [s.summary(self.window_s) for s in self.steps],
+            'result': self.result,
+            'error': self.error
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analyze a recorded capture for gain and frequency calibration')
+    parser.add_argument('capture')
+    parser.add_argument('--centerfreq', type=float, default=868.2, help='OGN CenterFreq (MHz)')
+    parser.add_argument('--freqcorr', type=float, default=0.0, help='FreqCorr (ppm) active during the capture')
+    args = parser.parse_args()
+
+    steps = read_capture_steps(args.capture)
+    result = recommend(steps, args.centerfreq, args.freqcorr)
+    for s in result['steps']:
+        print(f"gain={s['gain']} positions={s['positions']} aircraft={s['aircraft']} "
+              f"rate={s['decode_rate_per_min']}/min snr={s['snr_db_median']}dB noise={s['noise_db_median']}dB")
+    if result['drift']:
+        d = result['drift']
+        print(f"Drift: {d['ppm']} ppm (spread {d['spread_ppm']} ppm over {d['aircraft']} aircraft)")
+    print(f"Recommended: Gain={result['gain']} FreqCorr={result['freqcorr']}")
+
+
+if __name__ == '__main__':
+    main()
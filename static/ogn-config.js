@@ -0,0 +1,106 @@
+async function toggleWifi(iface,action){
+const r=await fetch('/api/wifi/toggle',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({interface:iface,action:action})});
+const j=await r.json();document.getElementById('status').innerHTML='<div class="status '+(j.success?'success':'error')+'">'+j.message+'</div>';
+if(j.success)setTimeout(()=>location.reload(),2000);
+}
+async function deleteNetwork(id){
+if(!confirm('Delete this network?'))return;
+const r=await fetch('/api/wifi/delete',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({network_id:id})});
+const j=await r.json();document.getElementById('status').innerHTML='<div class="status '+(j.success?'success':'error')+'">'+j.message+'</div>';
+if(j.success)setTimeout(()=>location.reload(),1500);
+}
+function editNetwork(id,ssid){
+const psk=prompt('Enter new password for '+ssid+':');
+if(!psk)return;
+fetch('/api/wifi/edit',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({network_id:id,psk:psk})})
+.then(r=>r.json()).then(j=>{document.getElementById('status').innerHTML='<div class="status '+(j.success?'success':'error')+'">'+j.message+'</div>';
+if(j.success)setTimeout(()=>location.reload(),1500);});
+}
+async function unregisterHFSS(){
+if(!confirm('Unregister from Alpium? Heartbeat will stop.'))return;
+const r=await fetch('/api/hfss/unregister',{method:'POST'});
+const j=await r.json();document.getElementById('status').innerHTML='<div class="status '+(j.success?'success':'error')+'">'+j.message+'</div>';
+if(j.success)setTimeout(()=>location.reload(),1500);
+}
+async function startCalibration(){
+if(!confirm('Sweep the receiver gain now? Reception is interrupted while each step restarts the receiver.'))return;
+const r=await fetch('/api/calibration/start',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({apply:false,receiver:document.querySelector('#f [name=receiver]').value})});
+const j=await r.json();document.getElementById('status').innerHTML='<div class="status '+(j.success?'success':'error')+'">'+j.message+'</div>';
+if(j.success)pollCalibration();
+}
+async function pollCalibration(){
+const j=await (await fetch('/api/calibration/status')).json();
+const box=document.getElementById('calibration');box.style.display='block';
+let html='<strong>Calibration:</strong> '+j.state+(j.current_gain!=null?' (measuring gain '+j.current_gain+' dB)':'')+'<br>';
+(j.steps||[]).forEach(s=>{html+=s.gain+' dB: '+s.decode_rate_per_min+' pos/min, SNR '+s.snr_db_median+' dB, noise '+s.noise_db_median+' dB<br>';});
+if(j.result)html+='<strong>Recommended:</strong> Gain '+j.result.gain+' dB, FreqCorr '+j.result.freqcorr+' ppm';
+if(j.error)html+='<br><strong>Error:</strong> '+j.error;
+box.innerHTML=html;
+if(j.state==='running')setTimeout(pollCalibration,5000);
+}
+async function viewHeartbeatLogs(){
+const container=document.getElementById('heartbeat-logs');
+if(container.style.display==='none'){
+const r=await fetch('/api/hfss/heartbeat-logs');
+const j=await r.json();
+if(j.success){
+const logsDiv=document.getElementById('logs-container');
+logsDiv.innerHTML='';
+j.logs.reverse().forEach(log=>{
+const entry=document.createElement('div');
+entry.style.cssText='margin-bottom:15px;padding:12px;background:rgba(20,26,40,0.5);border-radius:8px;border:1px solid rgba(0,166,251,0.2)';
+const statusColor=log.response_status===200?'#14f195':log.response_status===0?'#9945ff':'#ff006e';
+const toggleId='log-'+Math.random().toString(36).substr(2,9);
+const header=document.createElement('div');
+header.style.marginBottom='10px';
+header.innerHTML='<strong style="color:'+statusColor+'">'+log.timestamp+'</strong> - <span style="font-weight:bold;color:'+statusColor+'">Status: '+log.response_status+'</span>';
+const btn=document.createElement('button');
+btn.className='btn btn-small';
+btn.textContent='Toggle Details';
+btn.onclick=function(){const d=document.getElementById(toggleId);d.style.display=d.style.display==='none'?'block':'none'};
+const details=document.createElement('div');
+details.id=toggleId;
+details.style.cssText='display:none;margin-top:10px';
+const payloadPre=document.createElement('pre');
+payloadPre.style.cssText='background:rgba(10,14,26,0.8);padding:10px;border-radius:6px;overflow-x:auto;font-size:11px;color:#adb5bd;border:1px solid rgba(0,166,251,0.2)';
+payloadPre.textContent=JSON.stringify(log.payload,null,2);
+const respPre=document.createElement('pre');
+respPre.style.cssText='background:rgba(10,14,26,0.8);padding:10px;border-radius:6px;overflow-x:auto;font-size:11px;margin-top:10px;color:#adb5bd;border:1px solid rgba(0,166,251,0.2)';
+respPre.textContent=log.response_text;
+details.innerHTML='<strong style="color:#00a6fb;">Payload:</strong>';
+details.appendChild(payloadPre);
+details.innerHTML+='<strong style="color:#00a6fb;display:block;margin-top:12px;">Response:</strong>';
+details.appendChild(respPre);
+entry.appendChild(header);
+entry.appendChild(btn);
+entry.appendChild(details);
+logsDiv.appendChild(entry);
+});
+container.style.display='block';
+}else{
+alert('Failed to load logs: '+j.message);
+}
+}else{
+container.style.display='none';
+}
+}
+document.getElementById('wifiForm').onsubmit=async(e)=>{e.preventDefault();
+const d=Object.fromEntries(new FormData(e.target));
+const r=await fetch('/api/wifi/add',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify(d)});
+const j=await r.json();document.getElementById('status').innerHTML='<div class="status '+(j.success?'success':'error')+'">'+j.message+'</div>';
+if(j.success){e.target.reset();setTimeout(()=>location.reload(),1500);}
+};
+if(document.getElementById('hfssForm')){
+document.getElementById('hfssForm').onsubmit=async(e)=>{e.preventDefault();
+const d=Object.fromEntries(new FormData(e.target));
+const r=await fetch('/api/hfss/register',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify(d)});
+const j=await r.json();document.getElementById('status').innerHTML='<div class="status '+(j.success?'success':'error')+'">'+j.message+'</div>';
+if(j.success)setTimeout(()=>location.reload(),2000);
+};
+}
+document.getElementById('f').onsubmit=async(e)=>{e.preventDefault();document.getElementById('b').disabled=true;
+const d=Object.fromEntries(new FormData(e.target));
+try{const r=await fetch('/api/save',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify(d)});
+const j=await r.json();document.getElementById('status').innerHTML='<div class="status '+(j.success?'success':'error')+'">'+j.message+'</div>';
+if(j.success)setTimeout(()=>location.reload(),2000);}catch(e){document.getElementById('status').innerHTML='<div class="status error">Error: '+e.message+'</div>';}
+document.getElementById('b').disabled=false;};
@@ -0,0 +1,20 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+# The modules live at the repository root next to the Flask app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ogn-config-web-alpium.py')
+
+
+@pytest.fixture
+def web_app():
+    """A fresh import of the Flask app module (its file name is not importable)"""
+    pytest.importorskip('flask')
+    spec = importlib.util.spec_from_file_location('ogn_config_web', APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,118 @@
+"""In-process stand-in for a wpa_supplicant control socket, for the WpaCtrl tests"""
+import os
+import socket
+import threading
+
+
+class FakeWpaSupplicant:
+    """Minimal in-process control socket server for exercising WpaCtrl without hardware.
+
+    Keeps networks in memory, records every command in `commands` and never
+    implements RECONFIGURE, so a client that bounces the interface fails loudly.
+    """
+
+    def __init__(self, ctrl_dir, iface='wlan0'):
+        self.path = os.path.join(ctrl_dir, iface)
+        self.commands = []
+        self.networks = {}
+        self.current = None
+        self.saved = 0
+        self.scan_table = []  # (bssid, frequency, signal, flags, ssid)
+        self.rssi = -55
+        self._next_id = 0
+        self._stop = threading.Event()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.path)
+        self._sock.settimeout(0.1)  # lets _serve notice close()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def add(self, ssid, psk='password', priority=0, current=False):
+        net_id = self._next_id
+        self._next_id += 1
+        self.networks[net_id] = {'ssid': ssid, 'psk': f'"{psk}"', 'priority': str(priority), 'disabled': False}
+        if current:
+            self.current = net_id
+        return net_id
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(1)
+        self._sock.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                data, addr = self._sock.recvfrom(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            command = data.decode('utf-8')
+            self.commands.append(command)
+            try:
+                reply = self._handle(command)
+            except (ValueError, KeyError, IndexError):
+                reply = 'FAIL\n'
+            if addr:
+                try:
+                    self._sock.sendto(reply.encode('utf-8'), addr)
+                except OSError:
+                    if self._stop.is_set():
+                        return  # closed while replying
+
+    def _handle(self, command):
+        cmd, _, args = command.partition(' ')
+        if cmd == 'STATUS':
+            if self.current is None:
+                return 'wpa_state=DISCONNECTED\n'
+            net = self.networks[self.current]
+            return f"bssid=02:00:00:00:00:01\nssid={net['ssid']}\nid={self.current}\nwpa_state=COMPLETED\nip_address=192.168.1.50\n"
+        if cmd == 'SIGNAL_POLL':
+            if self.current is None:
+                return 'FAIL\n'
+            return f'RSSI={self.rssi}\nLINKSPEED=65\nNOISE=9999\nFREQUENCY=2437\n'
+        if cmd == 'SCAN':
+            return 'OK\n'
+        if cmd == 'SCAN_RESULTS':
+            rows = ['bssid / frequency / signal level / flags / ssid']
+            rows += ['\t'.join(str(v) for v in row) for row in self.scan_table]
+            return '\n'.join(rows) + '\n'
+        if cmd == 'LIST_NETWORKS':
+            rows = ['network id / ssid / bssid / flags']
+            for net_id, net in sorted(self.networks.items()):
+                flags = '[CURRENT]' if net_id == self.current else '[DISABLED]' if net['disabled'] else ''
+                rows.append(f"{net_id}\t{net['ssid']}\tany\t{flags}")
+            return '\n'.join(rows) + '\n'
+        if cmd == 'ADD_NETWORK':
+            net_id = self._next_id
+            self._next_id += 1
+            self.networks[net_id] = {'ssid': '', 'psk': '', 'priority': '0', 'disabled': True}
+            return f'{net_id}\n'
+        if cmd == 'SET_NETWORK':
+            net_id, var, value = args.split(' ', 2)
+            net = self.networks[int(net_id)]
+            if var == 'ssid' and not value.startswith('"'):
+                value = bytes.fromhex(value).decode('utf-8')
+            net[var] = value
+            return 'OK\n'
+        if cmd == 'GET_NETWORK':
+            net_id, var = args.split(' ', 1)
+            if var == 'psk':
+                return 'FAIL\n'  # wpa_supplicant never reveals passphrases
+            return f"{self.networks[int(net_id)][var]}\n"
+        if cmd == 'ENABLE_NETWORK':
+            self.networks[int(args)]['disabled'] = False
+            return 'OK\n'
+        if cmd == 'REMOVE_NETWORK':
+            net_id = int(args)
+            del self.networks[net_id]
+            if self.current == net_id:
+                self.current = None
+            return 'OK\n'
+        if cmd == 'SAVE_CONFIG':
+            self.saved += 1
+            return 'OK\n'
+        return 'UNKNOWN COMMAND\n'
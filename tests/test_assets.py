@@ -0,0 +1,79 @@
+import gzip
+
+import pytest
+
+
+@pytest.fixture
+def client(web_app):
+    return web_app.app.test_client()
+
+
+def test_index_revalidates_with_etag(client):
+    first = client.get('/')
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'no-cache'
+    etag = first.headers['ETag']
+    again = client.get('/', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.data == b''
+    assert client.get('/', headers={'If-None-Match': '"stale"'}).status_code == 200
+
+
+def test_index_links_hashed_assets(web_app, client):
+    html = client.get('/').get_data(as_text=True)
+    for name in ('ogn-config.css', 'ogn-config.js'):
+        assert web_app.asset_url(name) in html
+        assert web_app.asset_url(name).startswith('/assets/')
+
+
+def test_asset_with_stale_digest_is_404(web_app, client):
+    assert client.get('/assets/0000000000000000/ogn-config.css').status_code == 404
+    assert client.get(f"/assets/{web_app.assets['ogn-config.css']['digest']}/missing.css").status_code == 404
+
+
+def test_asset_cache_headers(web_app, client):
+    reply = client.get(web_app.asset_url('ogn-config.js'))
+    assert reply.status_code == 200
+    assert reply.headers['Cache-Control'] == f'public, max-age={web_app.ASSET_MAX_AGE}, immutable'
+    assert reply.headers['Vary'] == 'Accept-Encoding'
+    assert reply.headers['ETag'].strip('"') == web_app.assets['ogn-config.js']['digest']
+    assert reply.content_type.startswith('application/javascript')
+
+
+def test_assets_are_precompressed_at_load(web_app):
+    css = web_app.assets['ogn-config.css']
+    assert gzip.decompress(css['gzip']) == css['identity']
+
+
+def test_content_encoding_negotiation(web_app, client):
+    url = web_app.asset_url('ogn-config.css')
+    identity = web_app.assets['ogn-config.css']['identity']
+
+    plain = client.get(url)
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.data == identity
+
+    gz = client.get(url, headers={'Accept-Encoding': 'gzip, deflate'})
+    assert gz.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(gz.data) == identity
+
+
+def test_brotli_preferred_when_available(web_app, client):
+    class FakeBrotli:
+        @staticmethod
+        def compress(data, quality):
+            return b'br:' + data
+
+    web_app.add_asset('test.css', b'body{}', FakeBrotli)
+    url = web_app.asset_url('test.css')
+    reply = client.get(url, headers={'Accept-Encoding': 'gzip, br'})
+    assert reply.headers['Content-Encoding'] == 'br'
+    assert reply.data == b'br:body{}'
+    assert client.get(url, headers={'Accept-Encoding': 'gzip'}).headers['Content-Encoding'] == 'gzip'
+
+
+def test_fonts_are_not_recompressed(web_app, client):
+    web_app.add_asset('fonts/test.woff2', b'wOF2fake')
+    reply = client.get(web_app.asset_url('fonts/test.woff2'), headers={'Accept-Encoding': 'gzip, br'})
+    assert 'Content-Encoding' not in reply.headers
+    assert reply.content_type == 'font/woff2'
@@ -0,0 +1,38 @@
+import subprocess
+
+
+def _no_subprocess(*args, **kwargs):
+    raise AssertionError(f'/api/health ran a subprocess: {args}')
+
+
+def test_health_answers_liveness_before_first_refresh(web_app, monkeypatch):
+    monkeypatch.setattr(subprocess, 'run', _no_subprocess)
+    reply = web_app.app.test_client().get('/api/health')
+    assert reply.status_code == 200
+    body = reply.get_json()
+    assert body['status'] == 'starting'
+    assert set(body['startup']) == {'ready_ms', 'first_byte_ms'}
+
+
+def test_health_serves_cached_body(web_app, monkeypatch):
+    calls = []
+    monkeypatch.setattr(web_app, 'build_health', lambda: calls.append(1) or {'status': 'ok', 'station': {'callsign': 'TEST'}})
+    web_app.refresh_health()
+    monkeypatch.setattr(subprocess, 'run', _no_subprocess)
+    client = web_app.app.test_client()
+    for _ in range(3):
+        body = client.get('/api/health').get_json()
+    assert body['station'] == {'callsign': 'TEST'}
+    assert body['age_s'] >= 0
+    assert 'startup' in body
+    assert calls == [1]
+
+
+def test_health_reports_refresh_failure(web_app, monkeypatch):
+    def broken():
+        raise RuntimeError('boom')
+    monkeypatch.setattr(web_app, 'build_health', broken)
+    web_app.refresh_health()
+    reply = web_app.app.test_client().get('/api/health')
+    assert reply.status_code == 500
+    assert reply.get_json()['message'] == 'boom'
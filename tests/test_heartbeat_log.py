@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def app_module(web_app, tmp_path, monkeypatch):
+    monkeypatch.setattr(web_app, 'HEARTBEAT_LOG_FILE', str(tmp_path / 'heartbeat_log.json'))
+    return web_app
+
+
+def test_heartbeats_are_appended_as_jsonl(app_module):
+    for i in range(3):
+        app_module.save_heartbeat_log({'seq': i}, 200, 'ok', 12.34)
+    with open(app_module.HEARTBEAT_LOG_FILE) as f:
+        lines = [json.loads(line) for line in f]
+    assert [e['payload']['seq'] for e in lines] == [0, 1, 2]
+    assert lines[0]['latency_ms'] == 12.3
+
+    app_module.load_heartbeat_history()
+    logs = app_module.heartbeat_history.snapshot()
+    assert [e['payload']['seq'] for e in logs] == [0, 1, 2]
+    assert logs[-1]['response_text'] == 'ok'
+
+
+def test_log_is_compacted_once_it_doubles(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'HEARTBEAT_HISTORY_SIZE', 5)
+    monkeypatch.setattr(app_module, 'heartbeat_history', app_module.HeartbeatHistory(5))
+    for i in range(11):
+        app_module.save_heartbeat_log({'seq': i}, 200, 'ok')
+    with open(app_module.HEARTBEAT_LOG_FILE) as f:
+        seqs = [json.loads(line)['payload']['seq'] for line in f]
+    assert seqs == [6, 7, 8, 9, 10]
+
+
+def test_legacy_json_list_is_loaded_and_converted(app_module):
+    legacy = [{'timestamp': '2026-01-01T00:00:00', 'payload': {'seq': 0}, 'response_status': 200,
+               'response_text': 'ok', 'latency_ms': 5.0}]
+    with open(app_module.HEARTBEAT_LOG_FILE, 'w') as f:
+        json.dump(legacy, f)
+    app_module.load_heartbeat_history()
+    assert app_module.heartbeat_history.snapshot()[0]['payload'] == {'seq': 0}
+    app_module.save_heartbeat_log({'seq': 1}, 200, 'ok')
+    with open(app_module.HEARTBEAT_LOG_FILE) as f:
+        assert [json.loads(line)['payload']['seq'] for line in f] == [0, 1]
@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+
+import ogn_capture
+from ogn_capture import CaptureWriter, read_capture, capture_start_time, benchmark, record_logs
+
+RF_LINE = '868.200MHz Gain=40.0dB Noise=-27.5dB Signals=1'
+APRS_LINE = '0.240sec:868.394MHz: 1:2:DD8F1C 103017: [ +46.12345, +8.12345]deg 1234m + 9.5dB +2.36kHz 0e'
+
+
+class ListSink:
+    def __init__(self):
+        self.lines = []
+
+    def write(self, stream, line, ts=None):
+        self.lines.append((stream, line))
+
+
+def make_capture(path, count=200):
+    with CaptureWriter(path, start=1000.0) as w:
+        for i in range(count):
+            w.write('rf', f'{RF_LINE} #{i}', 1000.0 + i * 0.01)
+            w.write('aprs', f'{APRS_LINE} #{i}', 1000.0 + i * 0.01 + 0.005)
+
+
+def test_round_trip_read_capture(tmp_path):
+    path = str(tmp_path / 'stream.ogncap')
+    make_capture(path, count=50)
+    assert capture_start_time(path) == 1000.0
+    records = list(read_capture(path))
+    assert len(records) == 100
+    assert records[0] == (0.0, 'rf', f'{RF_LINE} #0')
+    assert records[1][1:] == ('aprs', f'{APRS_LINE} #0')
+    assert records[-1][0] >= records[0][0]
+
+
+def test_round_trip_benchmark_delivers_every_line(tmp_path):
+    path = str(tmp_path / 'stream.ogncap')
+    make_capture(path)
+    seen = ListSink()
+    result = benchmark(path, consumer=seen.write, speed=0)
+    assert result['lines'] == 400
+    assert sorted(seen.lines) == sorted((s, t) for _, s, t in read_capture(path))
+    assert result['latency_ms']['p50'] is not None
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_record_logs_follows_truncation_and_rotation(tmp_path):
+    for port in ogn_capture.STREAMS.values():
+        (tmp_path / str(port)).write_text('old line\n')
+    rf_log = tmp_path / str(ogn_capture.STREAMS['rf'])
+    sink = ListSink()
+    stop = threading.Event()
+    t = threading.Thread(target=record_logs, args=(sink, str(tmp_path)), kwargs={'stop_event': stop}, daemon=True)
+    t.start()
+    try:
+        time.sleep(0.3)
+        with open(rf_log, 'a') as f:
+            f.write('appended\n')
+        assert _wait_for(lambda: ('rf', 'appended') in sink.lines)
+
+        with open(rf_log, 'w') as f:  # copytruncate
+            f.write('after truncate\n')
+        assert _wait_for(lambda: ('rf', 'after truncate') in sink.lines)
+
+        os.rename(rf_log, str(rf_log) + '.1')  # logrotate create
+        rf_log.write_text('after rotate\n')
+        assert _wait_for(lambda: ('rf', 'after rotate') in sink.lines)
+    finally:
+        stop.set()
+        t.join(2)
+    assert ('rf', 'old line') not in sink.lines
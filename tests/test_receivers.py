@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from ogn_streams import DecodeRecord
+from reception_stats import ReceptionStats
+
+
+def decode(aircraft, fix_time='103017'):
+    return DecodeRecord(aircraft=aircraft, fix_time=fix_time, snr_db=9.5, freq_err_khz=2.4, bit_errors=0)
+
+
+def test_packet_heard_by_two_instances_counts_once():
+    stats = ReceptionStats(window_s=60, dedup_s=30)
+    assert stats.add('868', decode('DD8F1C'), 1000.0)
+    assert not stats.add('diversity', decode('DD8F1C'), 1000.4)
+    assert stats.add('diversity', decode('DD8F1C', '103019'), 1002.0)  # next fix is a new packet
+    assert stats.add('diversity', decode('3E1234'), 1002.5)
+
+    s = stats.snapshot(1003.0)
+    assert s['positions_per_min'] == 3.0
+    assert s['aircraft'] == 2
+    assert s['duplicates_per_min'] == 1.0
+    assert s['receivers'] == {
+        '868': {'positions_per_min': 1.0, 'aircraft': 1},
+        'diversity': {'positions_per_min': 3.0, 'aircraft': 2},
+    }
+
+
+def test_dedup_key_expires_after_dedup_window():
+    stats = ReceptionStats(window_s=300, dedup_s=30)
+    assert stats.add('868', decode('DD8F1C'), 1000.0)
+    assert not stats.add('diversity', decode('DD8F1C'), 1029.0)
+    assert stats.add('diversity', decode('DD8F1C'), 1031.0)  # key forgotten after dedup_s
+
+
+def test_counts_leave_the_window():
+    stats = ReceptionStats(window_s=60, dedup_s=30)
+    stats.add('868', decode('DD8F1C'), 1000.0)
+    stats.add('diversity', decode('DD8F1C'), 1000.5)
+    stats.add('868', decode('3E1234'), 1050.0)
+
+    s = stats.snapshot(1070.0)
+    assert s['positions_per_min'] == 1.0
+    assert s['duplicates_per_min'] == 0.0
+    assert s['receivers']['868'] == {'positions_per_min': 1.0, 'aircraft': 1}
+    assert s['receivers']['diversity'] == {'positions_per_min': 0.0, 'aircraft': 0}
+
+
+def test_record_without_fix_time_uses_arrival_second():
+    stats = ReceptionStats()
+    assert stats.add('868', decode('DD8F1C', None), 1000.2)
+    assert not stats.add('diversity', decode('DD8F1C', None), 1000.7)
+    assert stats.add('diversity', decode('DD8F1C', None), 1001.1)
+
+
+CONFIG = {'call': 'TESTSTN', 'latitude': 46.5, 'longitude': 8.25, 'altitude': 1200,
+          'freqcorr': 1.5, 'centerfreq': 868.2, 'gain': 32.8}
+
+
+@pytest.fixture
+def receivers(web_app, tmp_path, monkeypatch):
+    entries = [
+        {'name': '868', 'config_file': str(tmp_path / 'Template.conf'), 'device': 0},
+        {'name': 'diversity', 'config_file': str(tmp_path / 'Template-2.conf'), 'service': 'rtlsdr-ogn-2',
+         'http_port': 8090, 'rf_port': 50002, 'decode_port': 50003, 'pipe_port': 50020, 'device': 1},
+    ]
+    path = tmp_path / 'receivers.json'
+    path.write_text(json.dumps(entries))
+    monkeypatch.setattr(web_app, 'RECEIVERS_FILE', str(path))
+    return web_app
+
+
+def test_get_receiver_fills_defaults_and_rejects_unknown(receivers):
+    assert receivers.get_receiver()['name'] == '868'
+    primary = receivers.get_receiver('868')
+    assert (primary['http_port'], primary['rf_port'], primary['pipe_port']) == (8080, 50000, 50010)
+    assert receivers.get_receiver('diversity')['decode_port'] == 50003
+    with pytest.raises(ValueError):
+        receivers.get_receiver('nope')
+
+
+def test_write_config_targets_the_instance(receivers, tmp_path):
+    second = receivers.get_receiver('diversity')
+    assert receivers.write_config(CONFIG, second)
+    text = (tmp_path / 'Template-2.conf').read_text()
+    assert 'Device = 1;' in text
+    assert 'PipeName = "localhost:50020";' in text
+    assert 'Port = 8090;' in text
+    assert not (tmp_path / 'Template.conf').exists()
+    assert receivers.read_config(second) == CONFIG
+
+
+def test_index_404_for_unknown_receiver(receivers):
+    assert receivers.app.test_client().get('/?receiver=nope').status_code == 404
@@ -0,0 +1,93 @@
+import pytest
+
+pytest.importorskip('numpy')
+
+from ogn_capture import CaptureWriter, read_capture, capture_start_time
+from rf_analyzer import RfAnalyzer
+
+START = 1_700_000_000.0
+
+
+def write_noise(w, t0, minutes, noise_db):
+    """One ogn-rf status line per second, with a little ripple on the noise level"""
+    for i in range(int(minutes * 60)):
+        w.write('rf', f'868.200MHz Gain=40.0dB Noise={noise_db + (i % 5) * 0.2:.1f}dB Signals={i % 3}', t0 + i)
+    return t0 + minutes * 60
+
+
+def replay(path, analyzer, every_s=60):
+    """Feed a capture into the analyzer, yielding (elapsed minutes, snapshot) once per every_s"""
+    start = capture_start_time(path)
+    next_snapshot = every_s
+    for offset, stream, text in read_capture(path):
+        if stream != 'rf':
+            continue
+        analyzer.feed(text, start + offset)
+        if offset >= next_snapshot:
+            yield offset / 60.0, analyzer.snapshot(start + offset)
+            next_snapshot += every_s
+
+
+def test_persistent_noise_drop_stays_flagged(tmp_path):
+    path = str(tmp_path / 'lna.ogncap')
+    with CaptureWriter(path, start=START) as w:
+        t = write_noise(w, START, 40, -30.0)
+        write_noise(w, t, 120, -35.0)  # LNA loses 5 dB and never comes back
+
+    flags = {round(minute): s['lna_suspect'] for minute, s in replay(path, RfAnalyzer())}
+    assert not any(flags[m] for m in range(10, 40))
+    assert all(flags[m] for m in range(50, 160)), [m for m in range(50, 160) if not flags[m]]
+
+
+def test_interference_clears_when_floor_returns(tmp_path):
+    path = str(tmp_path / 'interference.ogncap')
+    with CaptureWriter(path, start=START) as w:
+        t = write_noise(w, START, 30, -30.0)
+        t = write_noise(w, t, 60, -22.0)  # new local noise source for an hour
+        write_noise(w, t, 30, -30.0)
+
+    snaps = {round(minute): s for minute, s in replay(path, RfAnalyzer())}
+    assert all(snaps[m]['interference_suspect'] for m in range(40, 90))
+    assert snaps[89]['noise_floor_drift_db'] >= 6
+    assert not any(snaps[m]['interference_suspect'] for m in range(100, 120))
+    assert abs(snaps[119]['noise_floor_baseline_db'] - snaps[20]['noise_floor_baseline_db']) < 0.5
+
+
+def test_slow_drift_is_followed_not_flagged(tmp_path):
+    path = str(tmp_path / 'drift.ogncap')
+    with CaptureWriter(path, start=START) as w:
+        t = START
+        for step in range(12):  # 2.4 dB over two hours
+            t = write_noise(w, t, 10, -30.0 + step * 0.2)
+
+    snaps = [s for _, s in replay(path, RfAnalyzer())]
+    assert not any(s['lna_suspect'] or s['interference_suspect'] for s in snaps)
+
+
+def test_summary_reports_baseline_fields():
+    analyzer = RfAnalyzer()
+    assert analyzer.summary(START)['noise_floor_drift_db'] is None
+    for i in range(900):
+        analyzer.feed('868.200MHz Gain=40.0dB Noise=-30.0dB Signals=1', START + i)
+    s = analyzer.summary(START + 900)
+    assert s['noise_floor_db'] == -30.0
+    assert s['noise_floor_drift_db'] == 0.0
+
+
+def test_gain_change_starts_a_new_baseline(tmp_path):
+    path = str(tmp_path / 'gain_step.ogncap')
+    with CaptureWriter(path, start=START) as w:
+        t = START
+        for i in range(40 * 60):
+            w.write('rf', f'868.200MHz Gain=40.2dB Noise={-30.0 + (i % 5) * 0.2:.1f}dB Signals=1', t + i)
+        t += 40 * 60
+        for i in range(3 * 3600):  # calibration applied a lower gain
+            w.write('rf', f'868.200MHz Gain=32.8dB Noise={-34.0 + (i % 5) * 0.2:.1f}dB Signals=1', t + i)
+
+    analyzer = RfAnalyzer()
+    snaps = {round(minute): s for minute, s in replay(path, analyzer)}
+    assert not any(s['lna_suspect'] for s in snaps.values())
+    summary = analyzer.summary(START + (40 + 3 * 60) * 60)
+    assert summary['noise_floor_drift_db'] == 0.0
+    assert snaps[30]['noise_floor_baseline_db'] == -30.0
+    assert snaps[3 * 60]['noise_floor_baseline_db'] == -34.0
@@ -0,0 +1,67 @@
+import pytest
+
+from ogn_capture import CaptureWriter
+from rf_calibration import CalibrationJob, read_capture_steps, recommend
+
+# Per-aircraft frequency offsets (kHz); their median, 2.1 kHz, is the receiver's error
+OFFSETS = {'DD0001': 2.0, 'DD0002': 2.5, 'DD0003': 1.5, 'DD0004': 2.2}
+
+
+def aprs_line(aircraft, n, khz, snr):
+    return f'0.240sec:868.394MHz: 1:2:{aircraft} {103000 + n:06d}: [ +46.12345, +8.12345]deg 1234m + {snr}dB {khz:+.2f}kHz 1e'
+
+
+def write_step(w, t, gain, positions, snr):
+    w.write('mark', f'gain {gain}', t)
+    for n in range(positions):
+        aircraft = list(OFFSETS)[n % len(OFFSETS)]
+        w.write('aprs', aprs_line(aircraft, n, OFFSETS[aircraft], snr), t + n * 60.0 / positions)
+        w.write('rf', f'868.200MHz Gain={gain}dB Noise={-30 + gain / 10:.1f}dB Signals=1', t + n * 60.0 / positions)
+
+
+@pytest.fixture
+def capture(tmp_path):
+    path = str(tmp_path / 'calibration.ogncap')
+    with CaptureWriter(path, start=1000.0) as w:
+        write_step(w, 1000.0, 20.7, 8, 6.0)
+        write_step(w, 1100.0, 32.8, 20, 9.0)
+        write_step(w, 1200.0, 40.2, 20, 8.5)
+    return path
+
+
+def test_read_capture_steps_splits_at_markers(capture):
+    steps = read_capture_steps(capture)
+    assert [s.gain for s in steps] == [20.7, 32.8, 40.2]
+    assert [s.positions for s in steps] == [8, 20, 20]
+    assert len(steps[1].freq_err) == 4
+    assert steps[2].summary(60)['decode_rate_per_min'] == 20.0
+
+
+def test_recommend_lowest_good_gain_and_freqcorr(capture):
+    result = recommend(read_capture_steps(capture), 868.2, 40.0, window_s=60)
+    assert result['gain'] == 32.8
+    assert result['drift']['aircraft'] == 4
+    assert result['drift']['ppm'] == round(2.1 * 1000 / 868.2, 2)
+    assert result['freqcorr'] == round(40.0 - result['drift']['ppm'], 1)
+
+
+def test_unmarked_capture_is_one_step(tmp_path):
+    path = str(tmp_path / 'plain.ogncap')
+    with CaptureWriter(path, start=1000.0) as w:
+        w.write('aprs', aprs_line('DD0001', 0, 2.0, 5.0), 1000.0)
+    steps = read_capture_steps(path)
+    assert len(steps) == 1 and steps[0].gain is None
+    assert recommend(steps, 868.2, 0.0)['drift'] is None  # too few aircraft
+
+
+@pytest.mark.parametrize('gains, window', [([20.7], 0), ([20.7], -5), ([0, 20.7], 60), ([], 60)])
+def test_job_rejects_invalid_sweep(gains, window):
+    with pytest.raises(ValueError):
+        CalibrationJob(gains, lambda gain: None, 868.2, 0, window_s=window)
+
+
+@pytest.mark.parametrize('body', [{'window': 0}, {'window': -1}, {'gains': [-3]}])
+def test_start_endpoint_rejects_invalid_sweep(web_app, body):
+    reply = web_app.app.test_client().post('/api/calibration/start', json=body).get_json()
+    assert reply['success'] is False
+    assert web_app.calibration_job is None
@@ -0,0 +1,177 @@
+import socket
+import time
+
+import pytest
+
+from uplink_monitor import UplinkMonitor, SocketProbe
+
+
+class SimulatedProbe:
+    """Probe backend returning scripted latencies: set results[iface] to ms or None"""
+
+    def __init__(self, results=None):
+        self.results = dict(results or {})
+
+    def probe(self, iface):
+        return self.results.get(iface)
+
+
+class SimulatedRoutes:
+    """Route backend that only records which interface is the default"""
+
+    def __init__(self, default=None, available=None):
+        self.default = default
+        self.available = set(available) if available is not None else None
+        self.changes = []
+
+    def default_interface(self):
+        return self.default
+
+    def set_default(self, iface):
+        if self.available is not None and iface not in self.available:
+            return False
+        self.changes.append(iface)
+        self.default = iface
+        return True
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_monitor(probe, routes, clock, **kwargs):
+    kwargs.setdefault('fail_threshold', 3)
+    kwargs.setdefault('healthy_threshold', 2)
+    kwargs.setdefault('failback_hold', 60.0)
+    return UplinkMonitor(['wlan0', 'eth1'], probe, routes, interval=2.0, clock=clock, log=lambda msg: None, **kwargs)
+
+
+def run(monitor, clock, steps, interval=2.0):
+    for _ in range(steps):
+        monitor.step()
+        clock.now += interval
+
+
+def test_fails_over_only_after_threshold():
+    clock = Clock()
+    probe = SimulatedProbe({'wlan0': 20.0, 'eth1': 80.0})
+    routes = SimulatedRoutes('wlan0')
+    monitor = make_monitor(probe, routes, clock)
+    run(monitor, clock, 3)
+
+    probe.results['wlan0'] = None
+    run(monitor, clock, 2)
+    assert routes.changes == []  # two failures are below fail_threshold
+
+    monitor.step()
+    assert routes.changes == ['eth1']
+    assert monitor.snapshot()['active'] == 'eth1'
+
+
+def test_time_to_recovery_is_measured_from_first_failure():
+    clock = Clock()
+    probe = SimulatedProbe({'wlan0': 20.0, 'eth1': 80.0})
+    routes = SimulatedRoutes('wlan0')
+    monitor = make_monitor(probe, routes, clock)
+    run(monitor, clock, 2)
+
+    probe.results['wlan0'] = None
+    run(monitor, clock, 3)
+    event = monitor.snapshot()['events'][-1]
+    assert event['reason'] == 'failover'
+    assert (event['from'], event['to']) == ('wlan0', 'eth1')
+    assert event['time_to_recovery_s'] == 4.0  # failures at t, t+2, switch at t+4
+    assert event['latency_ms'] == 80.0
+
+
+def test_failback_waits_for_hold_and_ignores_flaps():
+    clock = Clock()
+    probe = SimulatedProbe({'wlan0': None, 'eth1': 80.0})
+    routes = SimulatedRoutes('eth1')
+    monitor = make_monitor(probe, routes, clock, failback_hold=10.0)
+    run(monitor, clock, 2)
+
+    probe.results['wlan0'] = 20.0
+    run(monitor, clock, 4)  # healthy for 6 s, below the hold
+    probe.results['wlan0'] = None
+    run(monitor, clock, 1)  # flap resets the healthy streak
+    probe.results['wlan0'] = 20.0
+    run(monitor, clock, 5)
+    assert routes.changes == []
+
+    run(monitor, clock, 1)  # healthy since 10 s
+    assert routes.changes == ['wlan0']
+    event = monitor.snapshot()['events'][-1]
+    assert event['reason'] == 'failback'
+    assert event['time_to_recovery_s'] is None
+
+
+def test_failed_route_change_keeps_active_and_retries():
+    clock = Clock()
+    probe = SimulatedProbe({'wlan0': 20.0, 'eth1': 80.0})
+    routes = SimulatedRoutes('wlan0', available={'wlan0'})
+    monitor = make_monitor(probe, routes, clock)
+    run(monitor, clock, 2)
+
+    probe.results['wlan0'] = None
+    run(monitor, clock, 4)
+    assert routes.default == 'wlan0'
+    assert monitor.snapshot()['events'] == []
+
+    routes.available.add('eth1')
+    run(monitor, clock, 1)
+    assert routes.default == 'eth1'
+    assert monitor.snapshot()['events'][-1]['time_to_recovery_s'] == 8.0
+
+
+def test_no_failover_without_healthy_candidate():
+    clock = Clock()
+    probe = SimulatedProbe({'wlan0': None, 'eth1': None})
+    routes = SimulatedRoutes('wlan0')
+    monitor = make_monitor(probe, routes, clock)
+    run(monitor, clock, 5)
+    assert routes.changes == []
+
+
+def test_interfaces_are_probed_concurrently():
+    class SlowProbe:
+        def probe(self, iface):
+            time.sleep(0.3)
+            return None if iface == 'wlan0' else 50.0
+
+    monitor = make_monitor(SlowProbe(), SimulatedRoutes('wlan0'), Clock())
+    start = time.monotonic()
+    monitor.step()
+    assert time.monotonic() - start < 0.5
+
+
+def _bindtodevice_allowed():
+    sock = socket.socket()
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, 25, b'lo\0')
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+@pytest.mark.skipif(not _bindtodevice_allowed(), reason='SO_BINDTODEVICE needs CAP_NET_RAW')
+def test_socket_probe_uses_first_answering_target():
+    srv = socket.socket()
+    srv.bind(('127.0.0.1', 0))
+    srv.listen(1)
+    closed = socket.socket()
+    closed.bind(('127.0.0.1', 0))
+    closed_port = closed.getsockname()[1]
+    closed.close()
+    try:
+        probe = SocketProbe([('127.0.0.1', closed_port), ('127.0.0.1', srv.getsockname()[1])], timeout=1.0)
+        assert probe.probe('lo') is not None
+        assert SocketProbe([('127.0.0.1', closed_port)], timeout=0.5).probe('lo') is None
+    finally:
+        srv.close()
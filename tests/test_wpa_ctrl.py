@@ -0,0 +1,90 @@
+import shutil
+import tempfile
+
+import pytest
+
+from wpa_ctrl import WpaCtrl, WpaCtrlError
+from fake_wpa_supplicant import FakeWpaSupplicant
+
+
+@pytest.fixture
+def wpa():
+    ctrl_dir = tempfile.mkdtemp(prefix='wpa')  # short path, AF_UNIX names are limited to 108 bytes
+    fake = FakeWpaSupplicant(ctrl_dir)
+    client = WpaCtrl('wlan0', ctrl_dir, timeout=2)
+    yield fake, client
+    client.close()
+    fake.close()
+    shutil.rmtree(ctrl_dir, ignore_errors=True)
+
+
+def test_add_update_remove_keep_stable_ids(wpa):
+    fake, client = wpa
+    home = fake.add('home', current=True)
+    net_id = client.add_network('café wifi', 'secret123', priority=5)
+    assert net_id != home
+    assert fake.networks[net_id] == {'ssid': 'café wifi', 'psk': '"secret123"', 'priority': '5', 'disabled': False}
+    assert [n['id'] for n in client.list_networks()] == [home, net_id]
+
+    client.update_network(net_id, psk='newsecret', priority=7)
+    assert fake.networks[net_id]['psk'] == '"newsecret"'
+    assert fake.networks[net_id]['priority'] == '7'
+    assert client.get_network(net_id, 'priority') == '7'
+
+    client.remove_network(home)
+    assert list(fake.networks) == [net_id]
+    assert client.list_networks()[0]['id'] == net_id
+    assert fake.saved == 3
+
+
+def test_changes_never_reconfigure(wpa):
+    fake, client = wpa
+    home = fake.add('home', current=True)
+    net_id = client.add_network('backup', 'password1')
+    client.update_network(net_id, priority=1)
+    client.remove_network(net_id)
+    assert client.status()['ssid'] == 'home'
+    assert fake.current == home
+    assert not any(c.startswith('RECONFIGURE') for c in fake.commands)
+
+
+def test_remove_unknown_network_fails(wpa):
+    fake, client = wpa
+    with pytest.raises(WpaCtrlError):
+        client.remove_network(42)
+    assert fake.saved == 0
+
+
+def test_invalid_psk_is_rejected_before_sending(wpa):
+    fake, client = wpa
+    with pytest.raises(ValueError):
+        client.add_network('home', 'short')
+    assert fake.commands == []
+
+
+def test_failed_set_removes_the_half_added_network(wpa):
+    fake, client = wpa
+    handle = fake._handle
+    fake._handle = lambda command: 'FAIL\n' if ' priority ' in command else handle(command)
+    with pytest.raises(WpaCtrlError):
+        client.add_network('home', 'password1', priority=3)
+    assert fake.networks == {}
+    assert fake.commands[-1].startswith('REMOVE_NETWORK')
+    assert fake.saved == 0
+
+
+def test_signal_poll_and_scan_results(wpa):
+    fake, client = wpa
+    assert client.signal_poll() == {}
+    fake.add('home', current=True)
+    assert client.signal_poll()['RSSI'] == '-55'
+    fake.scan_table = [('02:00:00:00:00:02', 2412, -80, '[WPA2-PSK-CCMP][ESS]', 'far'),
+                       ('02:00:00:00:00:03', 2437, -40, '[WPA2-PSK-CCMP][ESS]', 'near')]
+    client.scan()
+    assert [r['ssid'] for r in client.scan_results()] == ['near', 'far']
+
+
+def test_unreachable_socket_raises():
+    client = WpaCtrl('wlan9', tempfile.gettempdir(), timeout=1)
+    with pytest.raises(WpaCtrlError):
+        client.status()
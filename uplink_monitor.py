@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Uplink Health Monitor
+Probes each uplink interface (wlan0, eth1/LTE) with interface-bound TCP connects
+and moves the default route to a healthy interface when the active one fails,
+with hysteresis so a flapping link does not cause route churn.
+
+Probe and route backends are pluggable: SocketProbe/IpRouteController act on the
+real system (or inside a network namespace); any object with the same probe()
+or default_interface()/set_default() methods can stand in for them.
+"""
+import collections
+import concurrent.futures
+import selectors
+import socket
+import subprocess
+import threading
+import time
+
+SO_BINDTODEVICE = getattr(socket, 'SO_BINDTODEVICE', 25)
+PROMOTED_METRIC = 5  # below dhcpcd's per-interface default route metrics
+RESOLVE_TTL = 600  # seconds between DNS refreshes of the probe targets
+RESOLVE_RETRY = 30  # seconds before retrying targets that did not resolve
+
+
+class SocketProbe:
+    """TCP connect probe bound to an interface with SO_BINDTODEVICE (needs root).
+
+    All targets are connected to in parallel and the probe returns the latency
+    in ms of the first to answer, or None once timeout expires. DNS is resolved
+    by a background thread, so a hanging resolver never stalls a probe.
+    """
+
+    def __init__(self, targets, timeout=2.0):
+        self.targets = targets  # [(host, port)]
+        self.timeout = timeout
+        self._addresses = {}
+        self._resolved = threading.Event()
+        self._resolver = None
+        self._lock = threading.Lock()
+
+    def _resolve_loop(self):
+        while True:
+            for host, port in self.targets:
+                try:
+                    info = socket.getaddrinfo(host, port, socket.AF_INET, socket.SOCK_STREAM)
+                    self._addresses[(host, port)] = info[0][4]
+                except OSError:
+                    pass  # keep the last known address while DNS is unreachable
+            self._resolved.set()
+            time.sleep(RESOLVE_TTL if len(self._addresses) == len(self.targets) else RESOLVE_RETRY)
+
+    def _start_resolver(self):
+        with self._lock:
+            if self._resolver is None:
+                self._resolver = threading.Thread(target=self._resolve_loop, daemon=True)
+                self._resolver.start()
+
+    def probe(self, iface):
+        self._start_resolver()
+        self._resolved.wait(self.timeout)  # only blocks until the first lookup
+        addresses = [a for a in (self._addresses.get(t) for t in self.targets) if a]
+        if not addresses:
+            return None
+        sel = selectors.DefaultSelector()
+        start = time.monotonic()
+        try:
+            for addr in addresses:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, SO_BINDTODEVICE, iface.encode() + b'\0')
+                    sock.setblocking(False)
+                    sock.connect_ex(addr)
+                except OSError:
+                    sock.close()
+                    continue
+                sel.register(sock, selectors.EVENT_WRITE)
+            deadline = start + self.timeout
+            while sel.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in sel.select(remaining):
+                    if key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                        return (time.monotonic() - start) * 1000
+                    sel.unregister(key.fileobj)
+                    key.fileobj.close()
+            return None
+        finally:
+            for key in list(sel.get_map().values()):
+                key.fileobj.close()
+            sel.close()
+
+
+def read_default_routes(path='/proc/net/route'):
+    """Default routes as {iface: (gateway, metric)}, lowest metric per interface"""
+    routes = {}
+    with open(path) as f:
+        next(f)
+        for line in f:
+            fields = line.split()
+            if len(fields) < 7 or fields[1] != '00000000':
+                continue
+            gateway = socket.inet_ntoa(int(fields[2], 16).to_bytes(4, 'little'))
+            metric = int(fields[6])
+            if fields[0] not in routes or metric < routes[fields[0]][1]:
+                routes[fields[0]] = (gateway, metric)
+    return routes
+
+
+class IpRouteController:
+    """Switch the default route by adding a low-metric copy of an interface's DHCP route"""
+
+    def __init__(self, route_file='/proc/net/route'):
+        self.route_file = route_file
+
+    def default_interface(self):
+        routes = read_default_routes(self.route_file)
+        return min(routes, key=lambda iface: routes[iface][1]) if routes else None
+
+    def set_default(self, iface):
+        routes = read_default_routes(self.route_file)
+        if iface not in routes:
+            return False
+        gateway = routes[iface][0]
+        result = subprocess.run(['ip', 'route', 'replace', 'default', 'via', gateway, 'dev', iface,
+                                 'metric', str(PROMOTED_METRIC)], capture_output=True, timeout=5)
+        if result.returncode != 0:
+            return False
+        for other, (_, metric) in routes.items():
+            if other != iface and metric == PROMOTED_METRIC:
+                subprocess.run(['ip', 'route', 'del', 'default', 'dev', other, 'metric', str(PROMOTED_METRIC)],
+                               capture_output=True, timeout=5)
+        return True
+
+
+class InterfaceHealth:
+    __slots__ = ('name', 'ok_streak', 'fail_streak', 'failing_since', 'healthy_since',
+                 'latency_ms', 'avg_latency_ms', 'probes', 'failures')
+
+    def __init__(self, name):
+        self.name = name
+        self.ok_streak = 0
+        self.fail_streak = 0
+        self.failing_since = None
+        self.healthy_since = None
+        self.latency_ms = None
+        self.avg_latency_ms = None
+        self.probes = 0
+        self.failures = 0
+
+    def update(self, latency_ms, now):
+        self.probes += 1
+        self.latency_ms = latency_ms
+        if latency_ms is None:
+            self.failures += 1
+            self.ok_streak = 0
+            self.healthy_since = None
+            if self.fail_streak == 0:
+                self.failing_since = now
+            self.fail_streak += 1
+        else:
+            self.fail_streak = 0
+            self.failing_since = None
+            if self.ok_streak == 0:
+                self.healthy_since = now
+            self.ok_streak += 1
+            self.avg_latency_ms = latency_ms if self.avg_latency_ms is None else \
+                0.8 * self.avg_latency_ms + 0.2 * latency_ms
+
+    def as_dict(self):
+        return {
+            'ok': self.fail_streak == 0 and self.probes > 0,
+            'latency_ms': None if self.latency_ms is None else round(self.latency_ms, 1),
+            'avg_latency_ms': None if self.avg_latency_ms is None else round(self.avg_latency_ms, 1),
+            'fail_streak': self.fail_streak,
+            'ok_streak': self.ok_streak,
+            'loss_percent': round(100.0 * self.failures / self.probes, 1) if self.probes else None
+        }
+
+
+class UplinkMonitor:
+    """Probe every interface each interval and fail over / fail back with hysteresis.
+
+    interfaces is in preference order. The active interface is abandoned after
+    fail_threshold consecutive failed probes, for a candidate with at least
+    healthy_threshold consecutive good probes. Traffic returns to a preferred
+    interface only once it has been healthy for failback_hold seconds.
+    """
+
+    def __init__(self, interfaces, probe, routes, interval=2.0, fail_threshold=3,
+                 healthy_threshold=2, failback_hold=60.0, clock=time.monotonic, log=print):
+        self.interfaces = list(interfaces)
+        self.probe = probe
+        self.routes = routes
+        self.interval = interval
+        self.fail_threshold = fail_threshold
+        self.healthy_threshold = healthy_threshold
+        self.failback_hold = failback_hold
+        self.clock = clock
+        self.log = log
+        self.health = {iface: InterfaceHealth(iface) for iface in self.interfaces}
+        self.events = collections.deque(maxlen=50)
+        self.active = None
+        # One worker per interface, so a dead link's timeout doesn't delay the others
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(self.interfaces)),
+                                                           thread_name_prefix='uplink-probe')
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = False
+
+    def _healthy(self, iface):
+        return self.health[iface].ok_streak >= self.healthy_threshold
+
+    def _switch(self, target, reason, outage_start, now):
+        if not self.routes.set_default(target):
+            self.log(f"Uplink: failed to move default route to {target}")
+            return False
+        event = {
+            'timestamp': time.time(),
+            'from': self.active,
+            'to': target,
+            'reason': reason,
+            'time_to_recovery_s': round(now - outage_start, 2) if outage_start is not None else None,
+            'latency_ms': self.health[target].as_dict()['latency_ms']
+        }
+        self.events.append(event)
+        recovery = f", time to recovery {event['time_to_recovery_s']}s" if event['time_to_recovery_s'] is not None else ''
+        self.log(f"Uplink {reason}: {self.active} -> {target}{recovery}")
+        self.active = target
+        return True
+
+    def step(self):
+        """Probe all interfaces once and apply failover/failback decisions"""
+        results = dict(zip(self.interfaces, self._pool.map(self.probe.probe, self.interfaces)))
+        now = self.clock()
+        with self._lock:
+            for iface, latency in results.items():
+                self.health[iface].update(latency, now)
+            self.active = self.routes.default_interface()
+            if self.active is not None and self.active not in self.health:
+                return  # default route is on an interface we don't manage
+            active = self.health.get(self.active)
+
+            if active is None or active.fail_streak >= self.fail_threshold:
+                candidates = [i for i in self.interfaces if i != self.active and self._healthy(i)]
+                if candidates:
+                    outage_start = active.failing_since if active else None
+                    self._switch(candidates[0], 'failover', outage_start, now)
+                return
+
+            # Fail back to a more preferred interface once it has been stable long enough
+            for iface in self.interfaces[:self.interfaces.index(self.active)]:
+                h = self.health[iface]
+                if self._healthy(iface) and now - h.healthy_since >= self.failback_hold:
+                    self._switch(iface, 'failback', None, now)
+                    return
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'active': self.active,
+                'interfaces': {iface: h.as_dict() for iface, h in self.health.items()},
+                'events': list(self.events)
+            }
+
+    def _run(self):
+        while self._running:
+            started = self.clock()
+            try:
+                self.step()
+            except Exception as e:
+                self.log(f"Uplink monitor error: {e}")
+            time.sleep(max(0.0, self.interval - (self.clock() - started)))
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
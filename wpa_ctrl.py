@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+wpa_supplicant Control Interface Client
+Talks to the control socket under /var/run/wpa_supplicant directly, so networks
+are managed by their stable wpa_supplicant IDs and changes are applied
+incrementally (no config rewrite, no `wpa_cli reconfigure` dropping the uplink).
+"""
+import itertools
+import os
+import socket
+import tempfile
+import threading
+
+WPA_CTRL_DIR = '/var/run/wpa_supplicant'
+
+_local_ids = itertools.count()
+
+
+class WpaCtrlError(Exception):
+    """A control interface command failed or wpa_supplicant is unreachable"""
+
+
+def _quote_psk(psk):
+    if len(psk) == 64 and all(c in '0123456789abcdefABCDEF' for c in psk):
+        return psk  # raw 256-bit PSK
+    if not 8 <= len(psk) <= 63 or not all(32 <= ord(c) < 127 for c in psk):
+        raise ValueError('Password must be 8-63 printable ASCII characters')
+    return f'"{psk}"'
+
+
+def _parse_table(reply):
+    """Parse a tab-separated table reply (LIST_NETWORKS, SCAN_RESULTS), skipping the header"""
+    return [line.split('\t') for line in reply.splitlines()[1:] if line]
+
+
+def _parse_kv(reply):
+    return dict(line.split('=', 1) for line in reply.splitlines() if '=' in line)
+
+
+class WpaCtrl:
+    """Client for one interface's wpa_supplicant control socket"""
+
+    def __init__(self, iface='wlan0', ctrl_dir=WPA_CTRL_DIR, timeout=5):
+        self.iface = iface
+        self.path = os.path.join(ctrl_dir, iface)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sock = None
+        self._local_path = None
+
+    def _connect(self):
+        local_path = os.path.join(tempfile.gettempdir(), f'wpa_ctrl_{os.getpid()}-{next(_local_ids)}')
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            if os.path.exists(local_path):
+                os.unlink(local_path)
+            sock.bind(local_path)
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+        except OSError as e:
+            sock.close()
+            if os.path.exists(local_path):
+                os.unlink(local_path)
+            raise WpaCtrlError(f'Cannot connect to {self.path}: {e}')
+        self._sock, self._local_path = sock, local_path
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+        if self._local_path and os.path.exists(self._local_path):
+            os.unlink(self._local_path)
+        self._local_path = None
+
+    def request(self, command):
+        """Send a raw control command and return the reply text"""
+        if '\n' in command:
+            raise ValueError('Control commands must be a single line')
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            try:
+                self._sock.send(command.encode('utf-8'))
+                while True:
+                    reply = self._sock.recv(65536).decode('utf-8', 'replace')
+                    if not reply.startswith('<'):  # skip unsolicited event messages
+                        return reply
+            except OSError as e:
+                self._close()
+                raise WpaCtrlError(f'{command.split()[0]} failed: {e}')
+
+    def _ok(self, command):
+        reply = self.request(command).strip()
+        if reply != 'OK':
+            raise WpaCtrlError(f'{command.split()[0]} failed: {reply}')
+
+    # Status
+
+    def status(self):
+        return _parse_kv(self.request('STATUS'))
+
+    def signal_poll(self):
+        """Current link RSSI/LINKSPEED/NOISE/FREQUENCY, empty when not associated"""
+        reply = self.request('SIGNAL_POLL')
+        return {} if reply.startswith('FAIL') else _parse_kv(reply)
+
+    def scan(self):
+        reply = self.request('SCAN').strip()
+        if reply not in ('OK', 'FAIL-BUSY'):  # busy means a scan is already running
+            raise WpaCtrlError(f'SCAN failed: {reply}')
+
+    def scan_results(self):
+        results = []
+        for row in _parse_table(self.request('SCAN_RESULTS')):
+            if len(row) < 4:
+                continue
+            results.append({
+                'bssid': row[0],
+                'frequency': int(row[1]),
+                'signal': int(row[2]),
+                'flags': row[3],
+                'ssid': row[4] if len(row) > 4 else ''
+            })
+        return sorted(results, key=lambda r: r['signal'], reverse=True)
+
+    # Configured networks
+
+    def list_networks(self):
+        networks = []
+        for row in _parse_table(self.request('LIST_NETWORKS')):
+            flags = row[3] if len(row) > 3 else ''
+            networks.append({
+                'id': int(row[0]),
+                'ssid': row[1] if len(row) > 1 else '',
+                'bssid': row[2] if len(row) > 2 else 'any',
+                'current': '[CURRENT]' in flags,
+                'disabled': '[DISABLED]' in flags
+            })
+        return networks
+
+    def get_network(self, net_id, var):
+        reply = self.request(f'GET_NETWORK {int(net_id)} {var}')
+        return None if reply.startswith('FAIL') else reply.strip()
+
+    def add_network(self, ssid, psk, priority=0):
+        """Add and enable a network without touching the others, returns its ID"""
+        psk = _quote_psk(psk)
+        reply = self.request('ADD_NETWORK').strip()
+        if not reply.isdigit():
+            raise WpaCtrlError(f'ADD_NETWORK failed: {reply}')
+        net_id = int(reply)
+        try:
+            self._ok(f'SET_NETWORK {net_id} ssid {ssid.encode("utf-8").hex()}')
+            self._ok(f'SET_NETWORK {net_id} psk {psk}')
+            self._ok(f'SET_NETWORK {net_id} priority {int(priority)}')
+            self._ok(f'ENABLE_NETWORK {net_id}')
+        except Exception:
+            self.request(f'REMOVE_NETWORK {net_id}')
+            raise
+        self.save_config()
+        return net_id
+
+    def update_network(self, net_id, psk=None, priority=None):
+        """Change a network in place; the current association is not dropped"""
+        if psk is not None:
+            self._ok(f'SET_NETWORK {int(net_id)} psk {_quote_psk(psk)}')
+        if priority is not None:
+            self._ok(f'SET_NETWORK {int(net_id)} priority {int(priority)}')
+        self.save_config()
+
+    def remove_network(self, net_id):
+        self._ok(f'REMOVE_NETWORK {int(net_id)}')
+        self.save_config()
+
+    def save_config(self):
+        """Persist to wpa_supplicant.conf (requires update_config=1)"""
+        self._ok('SAVE_CONFIG')
+